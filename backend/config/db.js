@@ -1,4 +1,5 @@
-const { Pool } = require('pg');
+const { Pool, Client } = require('pg');
+const { getRequestId, startSpan } = require('../middleware/tracing');
 
 // Create a connection pool to PostgreSQL
 const pool = new Pool({
@@ -7,9 +8,9 @@ const pool = new Pool({
   user: process.env.DB_USER || 'courseadmin',
   password: process.env.DB_PASSWORD || 'coursepass123',
   database: process.env.DB_NAME || 'course_registration',
-  max: 20,
+  max: parseInt(process.env.DB_POOL_MAX) || 20,
   idleTimeoutMillis: 30000,
-  connectionTimeoutMillis: 2000,
+  connectionTimeoutMillis: parseInt(process.env.DB_CONNECTION_TIMEOUT_MS) || 2000,
 });
 
 // Test database connection
@@ -17,26 +18,193 @@ pool.on('connect', () => {
   console.log('Connected to PostgreSQL database');
 });
 
+// An idle client died (e.g. the server restarted or the connection was cut).
+// pg removes it from the pool and opens a new one on the next checkout, so
+// log it and keep serving instead of taking the whole process down.
+let idleClientErrors = 0;
 pool.on('error', (err) => {
-  console.error('Unexpected error on idle client', err);
-  process.exit(-1);
+  idleClientErrors++;
+  console.error('Unexpected error on idle client', err.message);
 });
 
-// Helper function to execute queries
-const query = async (text, params) => {
+// Start times of db.query calls still waiting for a pool client. Map keeps
+// insertion order, so the first entry is always the longest waiter.
+const pendingCheckouts = new Map();
+let nextCheckoutId = 0;
+
+// How long the longest current waiter has been queued for a client
+const getOldestWaitMs = () => {
+  const oldest = pendingCheckouts.values().next().value;
+  return oldest === undefined ? 0 : Date.now() - oldest;
+};
+
+// Error code set on failures to get a client in time: every client stayed
+// busy for connectionTimeoutMillis, or opening a new one took that long.
+// Callers answer these with 503 + Retry-After rather than a 500.
+const POOL_TIMEOUT = 'POOL_TIMEOUT';
+const CHECKOUT_TIMEOUT_MESSAGES = [
+  'timeout exceeded when trying to connect',
+  'Connection terminated due to connection timeout'
+];
+
+const isPoolTimeout = (error) => Boolean(error) && error.code === POOL_TIMEOUT;
+
+// Collapse whitespace so multi-line SQL reads well in logs and traces
+const compactSql = (text) => text.replace(/\s+/g, ' ').trim();
+
+// Check out a client, run fn(client) on it and release it.
+// Checks out explicitly (like pool.query does internally) so that time spent
+// waiting for a free client shows up separately in traces.
+const withClient = async (text, fn) => {
   const start = Date.now();
+  const requestId = getRequestId();
+
+  const waitSpan = startSpan('pool.wait');
+  const checkoutId = nextCheckoutId++;
+  pendingCheckouts.set(checkoutId, start);
+  let client;
   try {
-    const res = await pool.query(text, params);
+    client = await pool.connect();
+  } catch (error) {
+    if (CHECKOUT_TIMEOUT_MESSAGES.includes(error.message)) {
+      error.code = POOL_TIMEOUT;
+    }
+    console.error('Database connection error:', { requestId, message: error.message });
+    throw error;
+  } finally {
+    pendingCheckouts.delete(checkoutId);
+    if (waitSpan) waitSpan.end();
+  }
+
+  const querySpan = startSpan('query', { sql: compactSql(text).slice(0, 120) });
+  try {
+    const res = await fn(client);
+    client.release();
     const duration = Date.now() - start;
-    console.log('Executed query', { text, duration, rows: res.rowCount });
+    console.log('Executed query', { requestId, text, duration, rows: res.rowCount });
     return res;
   } catch (error) {
+    // Same as pool.query: a client that errored is not reused (which also
+    // drops any transaction fn left open)
+    client.release(error);
     console.error('Database query error:', error);
     throw error;
+  } finally {
+    if (querySpan) querySpan.end();
   }
 };
 
+// Helper function to execute queries
+const query = (text, params) => withClient(text, client => client.query(text, params));
+
+// Run a read in a REPEATABLE READ transaction and add the snapshot it saw to
+// the result as `snapshot` ("xmin:xmax:xip,..."). Clients compare it with the
+// transaction ids on live seat-count changes to tell which ones the result
+// already includes. BEGIN and the snapshot read go in one round trip.
+const snapshotQuery = (text, params) => withClient(text, async (client) => {
+  const [, snapshotResult] = await client.query(
+    'BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY; SELECT pg_current_snapshot()::text AS snapshot'
+  );
+  const res = await client.query(text, params);
+  await client.query('COMMIT');
+  res.snapshot = snapshotResult.rows[0].snapshot;
+  return res;
+});
+
+// Single-flight for read queries: concurrent calls with the same SQL and
+// params share one in-flight query and its result. Only use this for
+// side-effect free SELECTs, and don't mutate the returned rows - every
+// caller gets the same result object.
+const inFlightReads = new Map();
+const singleFlightStats = { executed: 0, coalesced: 0 };
+
+// Params arrive as strings from req.query/req.params and as numbers from
+// parsed bodies; pg sends them as text either way, so key on the text form
+const normalizeParams = (params) => params.map(p => (p === null || p === undefined) ? null : String(p));
+
+// Pass { snapshot: true } to read through snapshotQuery, for results that
+// clients later patch with live seat-count changes.
+const sharedQuery = (text, params = [], { snapshot = false } = {}) => {
+  const key = `${snapshot ? 'snapshot|' : ''}${compactSql(text)}|${JSON.stringify(normalizeParams(params))}`;
+
+  const pending = inFlightReads.get(key);
+  if (pending) {
+    singleFlightStats.coalesced++;
+    const span = startSpan('query.coalesced');
+    return span ? pending.finally(span.end) : pending;
+  }
+
+  singleFlightStats.executed++;
+  const run = snapshot ? snapshotQuery : query;
+  const promise = run(text, params).finally(() => inFlightReads.delete(key));
+  inFlightReads.set(key, promise);
+  return promise;
+};
+
+// Share of read calls that were served by another caller's query
+const getSingleFlightStats = () => {
+  const total = singleFlightStats.executed + singleFlightStats.coalesced;
+  return {
+    ...singleFlightStats,
+    in_flight: inFlightReads.size,
+    coalescing_ratio: total === 0 ? 0 : singleFlightStats.coalesced / total
+  };
+};
+
+// LISTEN on a channel with a dedicated connection (outside the pool, which
+// would otherwise lose a slot for good). Reconnects if the connection drops or
+// can't be opened. Resolves once the first LISTEN is in place; onStateChange
+// is called with true/false whenever the channel goes up or down, since
+// notifications sent while it is down are lost.
+const LISTEN_RETRY_MS = 1000;
+
+const listen = (channel, onMessage, onStateChange = () => {}) => new Promise((resolve) => {
+  const connect = async () => {
+    const client = new Client(pool.options);
+    let reconnecting = false;
+
+    const reconnect = (err) => {
+      if (reconnecting) return;
+      reconnecting = true;
+      console.error(`LISTEN ${channel} connection error`, err ? err.message : 'connection ended');
+      onStateChange(false);
+      client.end().catch(() => {});
+      setTimeout(connect, LISTEN_RETRY_MS);
+    };
+
+    client.on('error', reconnect);
+    client.on('end', () => reconnect());
+    client.on('notification', (msg) => onMessage(msg.payload));
+    try {
+      await client.connect();
+      await client.query(`LISTEN ${channel}`);
+      onStateChange(true);
+      resolve();
+    } catch (error) {
+      reconnect(error);
+    }
+  };
+  connect();
+});
+
+// Snapshot of pool usage for admission control and the health endpoint
+const getPoolStats = () => ({
+  max: pool.options.max,
+  total: pool.totalCount,
+  idle: pool.idleCount,
+  waiting: pool.waitingCount,
+  oldestWaitMs: getOldestWaitMs(),
+  idleClientErrors
+});
+
 module.exports = {
+  POOL_TIMEOUT,
+  isPoolTimeout,
   query,
-  pool
+  snapshotQuery,
+  sharedQuery,
+  pool,
+  listen,
+  getPoolStats,
+  getSingleFlightStats
 };
\ No newline at end of file
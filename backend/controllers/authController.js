@@ -1,6 +1,9 @@
 const bcrypt = require('bcryptjs');
 const jwt = require('jsonwebtoken');
 const db = require('../config/db');
+const { traceAsync } = require('../middleware/tracing');
+const { serializers, sendSerialized } = require('../schemas/responseSchemas');
+const { sendError } = require('../utils/errorResponse');
 
 const JWT_SECRET = process.env.JWT_SECRET || 'your_secret_key';
 const JWT_EXPIRES_IN = '24h';
@@ -31,7 +34,7 @@ exports.register = async (req, res) => {
     }
 
     // Hash password
-    const hashedPassword = await bcrypt.hash(password, 10);
+    const hashedPassword = await traceAsync('bcrypt.hash', () => bcrypt.hash(password, 10));
 
     // Insert new user
     const result = await db.query(
@@ -64,7 +67,7 @@ exports.register = async (req, res) => {
     });
   } catch (error) {
     console.error('Registration error:', error);
-    res.status(500).json({ error: 'Registration failed', message: error.message });
+    sendError(res, error, 'Registration failed');
   }
 };
 
@@ -91,7 +94,7 @@ exports.login = async (req, res) => {
     const user = result.rows[0];
 
     // Check password
-    const isValidPassword = await bcrypt.compare(password, user.password);
+    const isValidPassword = await traceAsync('bcrypt.compare', () => bcrypt.compare(password, user.password));
 
     if (!isValidPassword) {
       return res.status(401).json({ error: 'Invalid email or password' });
@@ -123,7 +126,7 @@ exports.login = async (req, res) => {
     });
   } catch (error) {
     console.error('Login error:', error);
-    res.status(500).json({ error: 'Login failed', message: error.message });
+    sendError(res, error, 'Login failed');
   }
 };
 
@@ -142,9 +145,9 @@ exports.getProfile = async (req, res) => {
       return res.status(404).json({ error: 'User not found' });
     }
 
-    res.json({ user: result.rows[0] });
+    sendSerialized(res, serializers.profile, { user: result.rows[0] });
   } catch (error) {
     console.error('Get profile error:', error);
-    res.status(500).json({ error: 'Failed to get profile', message: error.message });
+    sendError(res, error, 'Failed to get profile');
   }
 };
\ No newline at end of file
@@ -1,4 +1,6 @@
 const db = require('../config/db');
+const { serializers, sendSerialized } = require('../schemas/responseSchemas');
+const { sendError } = require('../utils/errorResponse');
 
 // Get all courses (optionally filtered by level)
 exports.getAllCourses = async (req, res) => {
@@ -20,12 +22,12 @@ exports.getAllCourses = async (req, res) => {
     
     query += ` GROUP BY c.id ORDER BY c.level, c.semester, c.course_code`;
     
-    const result = await db.query(query, params);
+    const result = await db.sharedQuery(query, params, { snapshot: true });
 
-    res.json({ courses: result.rows });
+    sendSerialized(res, serializers.courseList, { courses: result.rows, seat_snapshot: result.snapshot });
   } catch (error) {
     console.error('Get courses error:', error);
-    res.status(500).json({ error: 'Failed to fetch courses', message: error.message });
+    sendError(res, error, 'Failed to fetch courses');
   }
 };
 
@@ -34,7 +36,7 @@ exports.getCoursesByLevelAndSemester = async (req, res) => {
   try {
     const { level, semester } = req.params;
 
-    const result = await db.query(`
+    const result = await db.sharedQuery(`
       SELECT c.*, 
              COUNT(e.id) as enrolled_students
       FROM courses c
@@ -42,12 +44,12 @@ exports.getCoursesByLevelAndSemester = async (req, res) => {
       WHERE c.level = $1 AND c.semester = $2
       GROUP BY c.id
       ORDER BY c.course_code
-    `, [level, semester]);
+    `, [level, semester], { snapshot: true });
 
-    res.json({ courses: result.rows });
+    sendSerialized(res, serializers.courseList, { courses: result.rows, seat_snapshot: result.snapshot });
   } catch (error) {
     console.error('Get courses error:', error);
-    res.status(500).json({ error: 'Failed to fetch courses', message: error.message });
+    sendError(res, error, 'Failed to fetch courses');
   }
 };
 
@@ -56,7 +58,7 @@ exports.getCourseById = async (req, res) => {
   try {
     const { id } = req.params;
 
-    const result = await db.query(`
+    const result = await db.sharedQuery(`
       SELECT c.*, 
              COUNT(e.id) as enrolled_students
       FROM courses c
@@ -69,10 +71,10 @@ exports.getCourseById = async (req, res) => {
       return res.status(404).json({ error: 'Course not found' });
     }
 
-    res.json({ course: result.rows[0] });
+    sendSerialized(res, serializers.course, { course: result.rows[0] });
   } catch (error) {
     console.error('Get course error:', error);
-    res.status(500).json({ error: 'Failed to fetch course', message: error.message });
+    sendError(res, error, 'Failed to fetch course');
   }
 };
 
@@ -123,7 +125,7 @@ exports.createCourse = async (req, res) => {
     });
   } catch (error) {
     console.error('Create course error:', error);
-    res.status(500).json({ error: 'Failed to create course', message: error.message });
+    sendError(res, error, 'Failed to create course');
   }
 };
 
@@ -159,7 +161,7 @@ exports.updateCourse = async (req, res) => {
     });
   } catch (error) {
     console.error('Update course error:', error);
-    res.status(500).json({ error: 'Failed to update course', message: error.message });
+    sendError(res, error, 'Failed to update course');
   }
 };
 
@@ -180,6 +182,6 @@ exports.deleteCourse = async (req, res) => {
     res.json({ message: 'Course deleted successfully' });
   } catch (error) {
     console.error('Delete course error:', error);
-    res.status(500).json({ error: 'Failed to delete course', message: error.message });
+    sendError(res, error, 'Failed to delete course');
   }
 };
\ No newline at end of file
@@ -1,4 +1,13 @@
 const db = require('../config/db');
+const { serializers, sendSerialized } = require('../schemas/responseSchemas');
+const { applyEnrollment } = require('../services/enrollmentService');
+const enrollmentQueue = require('../services/enrollmentQueue');
+const { sendError } = require('../utils/errorResponse');
+const { isValidId } = require('../utils/ids');
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+const MAX_JOB_WAIT_SECONDS = 25;
+const QUEUE_STARTING_RETRY_SECONDS = 5;
 
 // Enroll in a course - FIXED VERSION
 exports.enrollCourse = async (req, res) => {
@@ -6,60 +15,62 @@ exports.enrollCourse = async (req, res) => {
     const { course_id } = req.body;
     const user_id = req.user.id;
 
-    // Check if course exists
-    const courseResult = await db.query('SELECT * FROM courses WHERE id = $1', [course_id]);
-
-    if (courseResult.rows.length === 0) {
+    if (!isValidId(course_id)) {
       return res.status(404).json({ error: 'Course not found' });
     }
 
-    const course = courseResult.rows[0];
+    // Queued mode: record the intent and let the workers apply it
+    if (enrollmentQueue.isEnabled()) {
+      // Don't hand out tickets before the workers are up to process them
+      if (!enrollmentQueue.isRunning()) {
+        res.set('Retry-After', String(QUEUE_STARTING_RETRY_SECONDS));
+        return res.status(503).json({
+          error: 'Enrollment is starting up, please retry shortly',
+          retry_after: QUEUE_STARTING_RETRY_SECONDS
+        });
+      }
+
+      const job = await enrollmentQueue.enqueueEnrollment(user_id, course_id);
+
+      return res.status(202).json({
+        message: 'Enrollment request queued',
+        ticket: job.ticket,
+        status: job.status,
+        status_url: `/api/enrollments/jobs/${job.ticket}`
+      });
+    }
 
-    // Check if already enrolled (only check for 'enrolled' status, ignore 'dropped')
-    const existingEnrollment = await db.query(
-      'SELECT * FROM enrollments WHERE user_id = $1 AND course_id = $2 AND status = $3',
-      [user_id, course_id, 'enrolled']
-    );
+    const { statusCode, body } = await applyEnrollment(db, user_id, course_id);
+    res.status(statusCode).json(body);
+  } catch (error) {
+    console.error('Enrollment error:', error);
+    sendError(res, error, 'Failed to enroll in course');
+  }
+};
 
-    if (existingEnrollment.rows.length > 0) {
-      return res.status(400).json({ error: 'Already enrolled in this course' });
-    }
+// Get the outcome of a queued enrollment (?wait=<seconds> to long-poll)
+exports.getEnrollmentJob = async (req, res) => {
+  try {
+    const { ticket } = req.params;
+    const user_id = req.user.id;
 
-    // Check if previously dropped - allow re-enrollment
-    const droppedEnrollment = await db.query(
-      'SELECT * FROM enrollments WHERE user_id = $1 AND course_id = $2 AND status = $3',
-      [user_id, course_id, 'dropped']
-    );
-
-    if (droppedEnrollment.rows.length > 0) {
-      // Update from 'dropped' back to 'enrolled'
-      const updateResult = await db.query(`
-        UPDATE enrollments 
-        SET status = 'enrolled', enrollment_date = CURRENT_TIMESTAMP
-        WHERE user_id = $1 AND course_id = $2
-        RETURNING *
-      `, [user_id, course_id]);
-      
-      return res.json({
-        message: 'Successfully re-enrolled in course',
-        enrollment: updateResult.rows[0]
-      });
+    if (!UUID_PATTERN.test(ticket)) {
+      return res.status(404).json({ error: 'Enrollment ticket not found' });
     }
 
-    // New enrollment
-    const result = await db.query(`
-      INSERT INTO enrollments (user_id, course_id, status)
-      VALUES ($1, $2, 'enrolled')
-      RETURNING *
-    `, [user_id, course_id]);
+    const waitSeconds = Math.min(parseInt(req.query.wait) || 0, MAX_JOB_WAIT_SECONDS);
+    const job = waitSeconds > 0
+      ? await enrollmentQueue.waitForJob(ticket, user_id, waitSeconds * 1000)
+      : await enrollmentQueue.getJob(ticket, user_id);
 
-    res.status(201).json({
-      message: 'Successfully enrolled in course',
-      enrollment: result.rows[0]
-    });
+    if (!job) {
+      return res.status(404).json({ error: 'Enrollment ticket not found' });
+    }
+
+    res.json({ job });
   } catch (error) {
-    console.error('Enrollment error:', error);
-    res.status(500).json({ error: 'Failed to enroll in course', message: error.message });
+    console.error('Get enrollment job error:', error);
+    sendError(res, error, 'Failed to fetch enrollment status');
   }
 };
 
@@ -86,7 +97,7 @@ exports.dropCourse = async (req, res) => {
     });
   } catch (error) {
     console.error('Drop course error:', error);
-    res.status(500).json({ error: 'Failed to drop course', message: error.message });
+    sendError(res, error, 'Failed to drop course');
   }
 };
 
@@ -107,10 +118,10 @@ exports.getMyEnrollments = async (req, res) => {
       ORDER BY c.level, c.semester, c.course_code
     `, [user_id]);
 
-    res.json({ enrollments: result.rows });
+    sendSerialized(res, serializers.myEnrollmentList, { enrollments: result.rows });
   } catch (error) {
     console.error('Get enrollments error:', error);
-    res.status(500).json({ error: 'Failed to fetch enrollments', message: error.message });
+    sendError(res, error, 'Failed to fetch enrollments');
   }
 };
 
@@ -136,10 +147,10 @@ exports.getAllEnrollments = async (req, res) => {
       ORDER BY e.enrollment_date DESC
     `);
 
-    res.json({ enrollments: result.rows });
+    sendSerialized(res, serializers.enrollmentList, { enrollments: result.rows });
   } catch (error) {
     console.error('Get all enrollments error:', error);
-    res.status(500).json({ error: 'Failed to fetch enrollments', message: error.message });
+    sendError(res, error, 'Failed to fetch enrollments');
   }
 };
 
@@ -165,9 +176,9 @@ exports.getCourseEnrollments = async (req, res) => {
       ORDER BY u.full_name
     `, [course_id]);
 
-    res.json({ students: result.rows });
+    sendSerialized(res, serializers.courseStudentList, { students: result.rows });
   } catch (error) {
     console.error('Get course enrollments error:', error);
-    res.status(500).json({ error: 'Failed to fetch course enrollments', message: error.message });
+    sendError(res, error, 'Failed to fetch course enrollments');
   }
 };
\ No newline at end of file
@@ -0,0 +1,28 @@
+const seatEvents = require('../services/seatEvents');
+
+const FEED_DOWN_RETRY_SECONDS = 5;
+
+// Stream live seat count changes (Server-Sent Events)
+exports.streamSeatCounts = (req, res) => {
+  // A stream that can never receive a change is worse than none
+  if (!seatEvents.isLive()) {
+    res.set('Retry-After', String(FEED_DOWN_RETRY_SECONDS));
+    return res.status(503).json({ error: 'Live seat updates are unavailable, please retry shortly' });
+  }
+
+  if (!seatEvents.addSubscriber(res)) {
+    res.set('Retry-After', '30');
+    return res.status(503).json({ error: 'Too many live subscribers, please retry shortly' });
+  }
+
+  res.set({
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'X-Accel-Buffering': 'no' // don't let nginx buffer the stream
+  });
+  res.flushHeaders();
+
+  // Tell EventSource how long to wait before reconnecting
+  res.write('retry: 3000\n\n');
+};
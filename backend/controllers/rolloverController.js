@@ -0,0 +1,80 @@
+const semesterRollover = require('../services/semesterRollover');
+const { sendError } = require('../utils/errorResponse');
+const { isValidId } = require('../utils/ids');
+
+// Start (or resume) archiving a semester (Admin only)
+exports.startRollover = async (req, res) => {
+  try {
+    const { session, semester, cutoff, chunk_size } = req.body;
+
+    if (!session || !semesterRollover.SESSION_PATTERN.test(session)) {
+      return res.status(400).json({ error: 'Session must look like 2024/2025' });
+    }
+
+    if (![1, 2].includes(parseInt(semester))) {
+      return res.status(400).json({ error: 'Semester must be 1 or 2' });
+    }
+
+    // Enrollments made before the cutoff are archived, so it must be in the past
+    if (!cutoff || !semesterRollover.CUTOFF_PATTERN.test(cutoff) || isNaN(new Date(cutoff))) {
+      return res.status(400).json({ error: 'Cutoff must be the semester end date, e.g. 2025-01-31' });
+    }
+
+    if (new Date(cutoff) > new Date()) {
+      return res.status(400).json({ error: 'Cutoff cannot be in the future' });
+    }
+
+    if (chunk_size !== undefined && !(parseInt(chunk_size) > 0)) {
+      return res.status(400).json({ error: 'Chunk size must be a positive number' });
+    }
+
+    const { job, cutoffConflict } = await semesterRollover.startRollover({
+      session,
+      semester: parseInt(semester),
+      cutoff,
+      chunkSize: chunk_size ? parseInt(chunk_size) : undefined
+    });
+
+    if (cutoffConflict) {
+      return res.status(409).json({
+        error: 'A rollover for this session and semester already exists with a different cutoff',
+        job
+      });
+    }
+
+    res.status(job.status === 'completed' ? 200 : 202).json({
+      message: job.status === 'completed' ? 'Semester already rolled over' : 'Semester rollover started',
+      job,
+      status_url: `/api/enrollments/rollover/${job.id}`
+    });
+  } catch (error) {
+    console.error('Start rollover error:', error);
+    sendError(res, error, 'Failed to start rollover');
+  }
+};
+
+// Get rollover progress (Admin only)
+exports.getRollover = async (req, res) => {
+  try {
+    const { job_id } = req.params;
+
+    if (!isValidId(job_id)) {
+      return res.status(404).json({ error: 'Rollover job not found' });
+    }
+
+    const job = await semesterRollover.getJob(parseInt(job_id));
+
+    if (!job) {
+      return res.status(404).json({ error: 'Rollover job not found' });
+    }
+
+    const total = parseInt(job.total_rows);
+    res.json({
+      job,
+      progress: total === 0 ? 1 : Math.min(1, parseInt(job.moved_rows) / total)
+    });
+  } catch (error) {
+    console.error('Get rollover error:', error);
+    sendError(res, error, 'Failed to fetch rollover status');
+  }
+};
\ No newline at end of file
@@ -0,0 +1,116 @@
+const db = require('../config/db');
+
+// Admission control: reject requests early with 503 + Retry-After when the
+// database pool is saturated, instead of letting them queue until they time out.
+//
+// Requests are classified by priority. Each priority has its own limit on the
+// number of requests waiting for a pool client, so catalog reads are shed first
+// and enrollment writes keep going the longest.
+const POOL_MAX = db.getPoolStats().max;
+
+const PRIORITY = {
+  HIGH: 'high',     // enrollment writes
+  NORMAL: 'normal', // auth, profile, enrollment reads, admin
+  LOW: 'low'        // public catalog reads
+};
+
+// Max pool wait-queue depth before a priority is shed
+const QUEUE_LIMITS = {
+  [PRIORITY.LOW]: parseInt(process.env.SHED_QUEUE_LOW) || Math.ceil(POOL_MAX * 0.5),
+  [PRIORITY.NORMAL]: parseInt(process.env.SHED_QUEUE_NORMAL) || POOL_MAX,
+  [PRIORITY.HIGH]: parseInt(process.env.SHED_QUEUE_HIGH) || POOL_MAX * 3
+};
+
+// If a query has been waiting this long for a pool client, we are falling
+// behind: stop admitting low priority work even if the queue limit isn't
+// reached yet. This looks at pool waits, not request age, so one slow admin
+// report doesn't make every catalog read look late.
+const MAX_POOL_WAIT_MS = parseInt(process.env.SHED_MAX_WAIT_MS) || 500;
+
+let inFlight = 0;
+
+const stats = {
+  admitted: 0,
+  shed: { [PRIORITY.LOW]: 0, [PRIORITY.NORMAL]: 0, [PRIORITY.HIGH]: 0 }
+};
+
+// Classify a request by how important it is to keep serving it under load
+const getPriority = (req) => {
+  const path = req.originalUrl.split('?')[0];
+
+  if (path.startsWith('/api/enrollments') && req.method !== 'GET') {
+    return PRIORITY.HIGH;
+  }
+  if (path.startsWith('/api/courses') && req.method === 'GET') {
+    return PRIORITY.LOW;
+  }
+  return PRIORITY.NORMAL;
+};
+
+// Enrollment job long-polls (?wait=N) sit idle for up to 25 s without holding
+// a pool client, like the event streams, so they are not admission controlled
+const isLongPoll = (req) => {
+  const path = req.originalUrl.split('?')[0];
+  return req.method === 'GET' &&
+    path.startsWith('/api/enrollments/jobs/') &&
+    parseInt(req.query.wait) > 0;
+};
+
+// Rough time for the pool to drain the current queue, assuming ~1 request
+// per client per second at worst
+const getRetryAfterSeconds = (waiting) => {
+  return Math.max(1, Math.ceil(waiting / POOL_MAX));
+};
+
+// 503 + Retry-After, for shed requests and for admitted ones whose query
+// still couldn't get a pool client in time
+const sendBusy = (res) => {
+  const retryAfter = getRetryAfterSeconds(db.getPoolStats().waiting);
+  res.set('Retry-After', String(retryAfter));
+  return res.status(503).json({
+    error: 'Server is busy, please retry shortly',
+    retry_after: retryAfter
+  });
+};
+
+exports.admissionControl = (req, res, next) => {
+  if (isLongPoll(req)) return next();
+
+  const priority = getPriority(req);
+  const { waiting, oldestWaitMs } = db.getPoolStats();
+
+  const queueFull = waiting >= QUEUE_LIMITS[priority];
+  const fallingBehind = priority === PRIORITY.LOW && oldestWaitMs > MAX_POOL_WAIT_MS;
+
+  if (queueFull || fallingBehind) {
+    stats.shed[priority]++;
+    return sendBusy(res);
+  }
+
+  stats.admitted++;
+  inFlight++;
+
+  // 'close' follows 'finish' on a normal response, count each request once
+  let released = false;
+  const release = () => {
+    if (released) return;
+    released = true;
+    inFlight--;
+  };
+  res.on('finish', release);
+  res.on('close', release);
+
+  next();
+};
+
+exports.sendBusy = sendBusy;
+
+// Current admission control state for the health endpoint
+exports.getLoadStats = () => ({
+  in_flight: inFlight,
+  max_pool_wait_ms: MAX_POOL_WAIT_MS,
+  admitted: stats.admitted,
+  shed: { ...stats.shed },
+  queue_limits: { ...QUEUE_LIMITS },
+  pool: db.getPoolStats()
+});
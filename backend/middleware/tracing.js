@@ -0,0 +1,137 @@
+const { AsyncLocalStorage } = require('async_hooks');
+const crypto = require('crypto');
+const fs = require('fs');
+const { getRouteTemplate } = require('../utils/routeTemplate');
+
+// Lightweight request tracing.
+//
+// Every request gets an id (reused from an incoming X-Request-Id header) that
+// is echoed back and attached to query logs. When TRACE_FILE is set, sampled
+// requests also record spans - middleware, controller, bcrypt, pool wait and
+// each query - and the finished trace is appended to TRACE_FILE as one JSON
+// line. trace_analyzer.py turns the file into per-route breakdowns.
+//
+// The current trace travels with the async context (AsyncLocalStorage), so
+// db.js can add spans without the request being passed around.
+const TRACE_FILE = process.env.TRACE_FILE;
+const SAMPLE_RATE = process.env.TRACE_SAMPLE_RATE ? parseFloat(process.env.TRACE_SAMPLE_RATE) : 1;
+
+const storage = new AsyncLocalStorage();
+const stream = TRACE_FILE ? fs.createWriteStream(TRACE_FILE, { flags: 'a' }) : null;
+
+const now = () => performance.now();
+const round = (ms) => Math.round(ms * 1000) / 1000;
+
+// Id of the request being handled, if any
+const getRequestId = () => {
+  const store = storage.getStore();
+  return store ? store.requestId : undefined;
+};
+
+// Start a span under the current one. Returns null when the request isn't traced.
+// Call end() on the returned span once the work is done.
+const startSpan = (name, attributes) => {
+  const store = storage.getStore();
+  if (!store || !store.trace) return null;
+
+  const { trace } = store;
+  const span = {
+    id: trace.spans.length + 1,
+    parent: store.spanId,
+    name,
+    start: round(now() - trace.startedAt),
+    duration: null
+  };
+  if (attributes) span.attributes = attributes;
+  trace.spans.push(span);
+
+  return {
+    id: span.id,
+    end: () => {
+      if (span.duration === null) {
+        span.duration = round(now() - trace.startedAt - span.start);
+      }
+    }
+  };
+};
+
+// Run fn with `span` as the parent of any spans it starts
+const runInSpan = (span, fn) => {
+  const store = storage.getStore();
+  return storage.run({ ...store, spanId: span.id }, fn);
+};
+
+// Trace an async operation, e.g. traceAsync('bcrypt.compare', () => bcrypt.compare(a, b))
+const traceAsync = async (name, fn, attributes) => {
+  const span = startSpan(name, attributes);
+  if (!span) return fn();
+  try {
+    return await runInSpan(span, fn);
+  } finally {
+    span.end();
+  }
+};
+
+// Wrap Express handlers so each call becomes a span. A middleware span ends
+// when it calls next() or responds; a controller span when its promise settles.
+const traceHandlers = (kind, handlers) => {
+  const traced = {};
+  Object.entries(handlers).forEach(([name, handler]) => {
+    traced[name] = (req, res, next) => {
+      const span = startSpan(`${kind}:${name}`);
+      if (!span) return handler(req, res, next);
+
+      const parentStore = storage.getStore();
+      const tracedNext = (...args) => {
+        span.end();
+        // Later handlers are siblings, not children of this span
+        storage.run(parentStore, () => next(...args));
+      };
+
+      const result = runInSpan(span, () => handler(req, res, tracedNext));
+      if (result && typeof result.then === 'function') {
+        result.then(span.end, span.end);
+      } else if (res.headersSent) {
+        span.end();
+      }
+      return result;
+    };
+  });
+  return traced;
+};
+
+const writeTrace = (req, res, trace) => {
+  const entry = {
+    id: trace.requestId,
+    ts: trace.timestamp,
+    method: req.method,
+    route: getRouteTemplate(req),
+    status: res.statusCode,
+    duration: round(now() - trace.startedAt),
+    // Spans still open when the response finished (e.g. a coalesced query) end here
+    spans: trace.spans.map(span => span.duration === null
+      ? { ...span, duration: round(now() - trace.startedAt - span.start) }
+      : span)
+  };
+  stream.write(JSON.stringify(entry) + '\n');
+};
+
+// Assign the request id and, if sampled, start recording a trace
+exports.traceRequest = (req, res, next) => {
+  const incomingId = req.get('X-Request-Id');
+  req.id = incomingId && incomingId.length <= 128 ? incomingId : crypto.randomUUID();
+  res.set('X-Request-Id', req.id);
+
+  let trace = null;
+  if (stream && Math.random() < SAMPLE_RATE) {
+    trace = { requestId: req.id, timestamp: Date.now(), startedAt: now(), spans: [] };
+    res.on('finish', () => writeTrace(req, res, trace));
+  }
+
+  storage.run({ requestId: req.id, trace, spanId: 0 }, next);
+};
+
+exports.getRequestId = getRequestId;
+exports.startSpan = startSpan;
+exports.traceAsync = traceAsync;
+exports.traceHandlers = traceHandlers;
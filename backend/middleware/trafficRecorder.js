@@ -0,0 +1,64 @@
+const crypto = require('crypto');
+const fs = require('fs');
+const { getRouteTemplate } = require('../utils/routeTemplate');
+
+// Traffic recorder for capacity testing.
+//
+// When TRAFFIC_RECORD_FILE is set, every API request is appended to that file
+// as one JSON line: arrival time, method, route template, params, query, body,
+// status, duration and a pseudonymous identity. traffic_replay.py replays the
+// file against a target server.
+//
+// Personal data never reaches the file: identifying body fields are replaced
+// with a type marker, and user ids are HMACed with TRAFFIC_RECORD_SALT. Use a
+// fixed salt to keep pseudonyms stable across restarts; without one, a random
+// salt is picked per process.
+const RECORD_FILE = process.env.TRAFFIC_RECORD_FILE;
+const SALT = process.env.TRAFFIC_RECORD_SALT || crypto.randomBytes(16).toString('hex');
+
+const REDACTED_FIELDS = ['email', 'password', 'full_name', 'phone', 'student_id'];
+
+const stream = RECORD_FILE ? fs.createWriteStream(RECORD_FILE, { flags: 'a' }) : null;
+
+const pseudonymize = (value) => {
+  return crypto.createHmac('sha256', SALT).update(String(value)).digest('hex').slice(0, 16);
+};
+
+// Keep the body's shape; identifying fields only record their type
+const sanitizeBody = (body) => {
+  if (!body || typeof body !== 'object') return null;
+
+  const sanitized = {};
+  Object.entries(body).forEach(([key, value]) => {
+    sanitized[key] = REDACTED_FIELDS.includes(key) ? `<${typeof value}>` : value;
+  });
+  return sanitized;
+};
+
+exports.recordTraffic = (req, res, next) => {
+  if (!stream) return next();
+
+  const startedAt = Date.now();
+  const start = process.hrtime.bigint();
+
+  res.on('finish', () => {
+    const entry = {
+      ts: startedAt,
+      method: req.method,
+      route: getRouteTemplate(req),
+      params: req.params,
+      query: req.query,
+      body: sanitizeBody(req.body),
+      status: res.statusCode,
+      duration_ms: Number(process.hrtime.bigint() - start) / 1e6,
+      user: req.user ? {
+        id: pseudonymize(req.user.id),
+        role: req.user.role,
+        level: req.user.level
+      } : null
+    };
+    stream.write(JSON.stringify(entry) + '\n');
+  });
+
+  next();
+};
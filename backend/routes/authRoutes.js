@@ -1,7 +1,8 @@
 const express = require('express');
 const router = express.Router();
-const authController = require('../controllers/authController');
-const { verifyToken } = require('../middleware/authMiddleware');
+const { traceHandlers } = require('../middleware/tracing');
+const authController = traceHandlers('controller', require('../controllers/authController'));
+const { verifyToken } = traceHandlers('middleware', require('../middleware/authMiddleware'));
 
 // Public routes
 router.post('/register', authController.register);
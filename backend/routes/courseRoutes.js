@@ -1,7 +1,8 @@
 const express = require('express');
 const router = express.Router();
-const courseController = require('../controllers/courseController');
-const { verifyToken, isAdmin } = require('../middleware/authMiddleware');
+const { traceHandlers } = require('../middleware/tracing');
+const courseController = traceHandlers('controller', require('../controllers/courseController'));
+const { verifyToken, isAdmin } = traceHandlers('middleware', require('../middleware/authMiddleware'));
 
 // Public routes (can view courses without login)
 router.get('/', courseController.getAllCourses);
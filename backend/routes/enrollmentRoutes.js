@@ -1,15 +1,20 @@
 const express = require('express');
 const router = express.Router();
-const enrollmentController = require('../controllers/enrollmentController');
-const { verifyToken, isAdmin } = require('../middleware/authMiddleware');
+const { traceHandlers } = require('../middleware/tracing');
+const enrollmentController = traceHandlers('controller', require('../controllers/enrollmentController'));
+const rolloverController = traceHandlers('controller', require('../controllers/rolloverController'));
+const { verifyToken, isAdmin } = traceHandlers('middleware', require('../middleware/authMiddleware'));
 
 // Student routes
 router.post('/enroll', verifyToken, enrollmentController.enrollCourse);
 router.put('/drop/:course_id', verifyToken, enrollmentController.dropCourse);
 router.get('/my-courses', verifyToken, enrollmentController.getMyEnrollments);
+router.get('/jobs/:ticket', verifyToken, enrollmentController.getEnrollmentJob);
 
 // Admin routes
 router.get('/', verifyToken, isAdmin, enrollmentController.getAllEnrollments);
 router.get('/course/:course_id', verifyToken, isAdmin, enrollmentController.getCourseEnrollments);
+router.post('/rollover', verifyToken, isAdmin, rolloverController.startRollover);
+router.get('/rollover/:job_id', verifyToken, isAdmin, rolloverController.getRollover);
 
 module.exports = router;
\ No newline at end of file
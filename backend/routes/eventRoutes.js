@@ -0,0 +1,8 @@
+const express = require('express');
+const router = express.Router();
+const eventController = require('../controllers/eventController');
+
+// Public live updates (Server-Sent Events)
+router.get('/seats', eventController.streamSeatCounts);
+
+module.exports = router;
\ No newline at end of file
@@ -0,0 +1,133 @@
+const fastJson = require('fast-json-stringify');
+
+// Response schemas for the large list payloads, compiled once at startup into
+// dedicated serializers. They skip JSON.stringify's generic property walk,
+// which dominates CPU for big lists.
+//
+// fast-json-stringify coerces a value to its declared type instead of failing,
+// so a type here must never be narrower than the column. The users/courses/
+// enrollments DDL is not in this repo, so no integer column is assumed to be
+// NOT NULL: they are all typed integer-or-null, and level also allows a
+// string because the auth controller treats it as possibly text
+// (parseInt(user.level)).
+//
+// Course and enrollment rows come from `c.*` selects, so they keep
+// additionalProperties: true and any column not listed here is still sent.
+// User payloads are closed on purpose: an unlisted column (e.g. password)
+// is never serialized even if a query starts selecting it.
+
+const nullableInteger = { type: ['integer', 'null'] };
+const level = { type: ['integer', 'string', 'null'] };
+const string = { type: 'string' };
+const nullableString = { type: ['string', 'null'] };
+const timestamp = { type: ['string', 'null'], format: 'date-time' };
+
+const course = {
+  type: 'object',
+  properties: {
+    id: nullableInteger,
+    course_code: string,
+    course_name: string,
+    credits: nullableInteger,
+    level,
+    semester: nullableInteger,
+    // COUNT() is a bigint, which pg returns as a string
+    enrolled_students: string,
+    created_at: timestamp,
+    updated_at: timestamp
+  },
+  additionalProperties: true
+};
+
+// A student's own enrollments: the course row plus enrollment fields
+const myEnrollment = {
+  type: 'object',
+  properties: {
+    ...course.properties,
+    enrollment_id: nullableInteger,
+    enrollment_date: timestamp,
+    status: string
+  },
+  additionalProperties: true
+};
+
+// Admin view of all enrollments
+const enrollment = {
+  type: 'object',
+  properties: {
+    id: nullableInteger,
+    enrollment_date: timestamp,
+    status: string,
+    full_name: string,
+    student_id: nullableString,
+    email: string,
+    student_level: level,
+    course_code: string,
+    course_name: string,
+    course_level: level,
+    semester: nullableInteger
+  },
+  additionalProperties: true
+};
+
+// Students enrolled in a course (admin)
+const courseStudent = {
+  type: 'object',
+  properties: {
+    id: nullableInteger,
+    enrollment_date: timestamp,
+    status: string,
+    user_id: nullableInteger,
+    full_name: string,
+    student_id: nullableString,
+    email: string,
+    phone: nullableString,
+    level
+  },
+  additionalProperties: true
+};
+
+const user = {
+  type: 'object',
+  properties: {
+    id: nullableInteger,
+    email: string,
+    full_name: string,
+    student_id: nullableString,
+    phone: nullableString,
+    role: string,
+    level,
+    created_at: timestamp
+  },
+  additionalProperties: false
+};
+
+const listOf = (key, item, extraProperties = {}) => fastJson({
+  type: 'object',
+  properties: { [key]: { type: 'array', items: item }, ...extraProperties }
+});
+
+const single = (key, item) => fastJson({
+  type: 'object',
+  properties: { [key]: item }
+});
+
+const serializers = {
+  // seat_snapshot: the database snapshot the counts were read under, see seatEvents.js
+  courseList: listOf('courses', course, { seat_snapshot: string }),
+  course: single('course', course),
+  myEnrollmentList: listOf('enrollments', myEnrollment),
+  enrollmentList: listOf('enrollments', enrollment),
+  courseStudentList: listOf('students', courseStudent),
+  profile: single('user', user)
+};
+
+// Send a payload through a compiled serializer instead of res.json()
+const sendSerialized = (res, serializer, payload) => {
+  res.type('application/json').send(serializer(payload));
+};
+
+module.exports = {
+  serializers,
+  sendSerialized
+};
@@ -2,41 +2,82 @@
 
 const express = require('express');
 const cors = require('cors');
+const compression = require('compression');
+const zlib = require('zlib');
 require('dotenv').config();
 
 const authRoutes = require('./routes/authRoutes');
 const courseRoutes = require('./routes/courseRoutes');
 const enrollmentRoutes = require('./routes/enrollmentRoutes');
+const eventRoutes = require('./routes/eventRoutes');
+const { admissionControl, getLoadStats } = require('./middleware/loadShedding');
+const { recordTraffic } = require('./middleware/trafficRecorder');
+const { traceRequest } = require('./middleware/tracing');
+const { sendError } = require('./utils/errorResponse');
+const { getSingleFlightStats } = require('./config/db');
+const enrollmentQueue = require('./services/enrollmentQueue');
+const seatEvents = require('./services/seatEvents');
 
 const app = express();
 const PORT = process.env.PORT || 5000;
 
 // Middleware
 app.use(cors());
+// No-op unless TRAFFIC_RECORD_FILE is set
+app.use(recordTraffic);
+// Shed load before parsing bodies; the health check and job long-polls are
+// always admitted
+app.use(['/api/auth', '/api/courses', '/api/enrollments'], admissionControl);
+// gzip/brotli for responses above the threshold; tiny bodies aren't worth the CPU.
+// On by default; set COMPRESSION=false when a proxy in front already compresses.
+// Event streams are never compressed, the compressor would buffer them.
+const COMPRESSION_ENABLED = process.env.COMPRESSION !== 'false';
+const COMPRESSION_THRESHOLD_BYTES = process.env.COMPRESSION_THRESHOLD_BYTES !== undefined
+  ? parseInt(process.env.COMPRESSION_THRESHOLD_BYTES)
+  : 1024;
+
+if (COMPRESSION_ENABLED) {
+  app.use(compression({
+    threshold: COMPRESSION_THRESHOLD_BYTES,
+    brotli: { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 4 } },
+    filter: (req, res) => {
+      if (String(res.getHeader('Content-Type')).startsWith('text/event-stream')) {
+        return false;
+      }
+      return compression.filter(req, res);
+    }
+  }));
+}
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
+// Request id + tracing. Must come after the body parsers: they resume the
+// request from stream callbacks, which would drop the trace context.
+app.use(traceRequest);
 
 // Routes
 app.use('/api/auth', authRoutes);
 app.use('/api/courses', courseRoutes);
 app.use('/api/enrollments', enrollmentRoutes);
+// Long-lived streams stay outside admission control
+app.use('/api/events', eventRoutes);
 
 // Health check endpoint
 app.get('/api/health', (req, res) => {
   res.json({ 
     status: 'ok', 
     message: 'Course Registration API is running',
-    timestamp: new Date().toISOString()
+    timestamp: new Date().toISOString(),
+    load: getLoadStats(),
+    single_flight: getSingleFlightStats(),
+    seat_events_live: seatEvents.isLive(),
+    seat_subscribers: seatEvents.getSubscriberCount()
   });
 });
 
 // Error handling middleware
 app.use((err, req, res, next) => {
   console.error(err.stack);
-  res.status(500).json({ 
-    error: 'Something went wrong!', 
-    message: err.message 
-  });
+  sendError(res, err, 'Something went wrong!');
 });
 
 // 404 handler
@@ -52,4 +93,11 @@ app.listen(PORT, () => {
   console.log(`Frontend URL: http://localhost:3000`);
   console.log(`Database: PostgreSQL at localhost:5432`);
   console.log(`===================================\n`);
+
+  seatEvents.start().catch((err) => {
+    console.error('Failed to start seat count events:', err);
+  });
+  enrollmentQueue.start().catch((err) => {
+    console.error('Failed to start enrollment queue:', err);
+  });
 });
\ No newline at end of file
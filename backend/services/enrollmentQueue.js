@@ -0,0 +1,218 @@
+const EventEmitter = require('events');
+const db = require('../config/db');
+const { applyEnrollment } = require('./enrollmentService');
+const { retryWithBackoff } = require('../utils/retry');
+
+// Durable enrollment queue.
+//
+// When ENROLLMENT_QUEUE=true, POST /api/enrollments/enroll only records an
+// intent in enrollment_jobs and returns 202 with a ticket. Background workers
+// claim pending jobs with FOR UPDATE SKIP LOCKED and apply a whole batch in a
+// single transaction, so a registration burst turns into a steady stream of
+// batched commits instead of one commit per request.
+//
+// Outcomes are stored on the job row and announced with NOTIFY, so any API
+// process can answer a client polling or waiting on its ticket.
+const ENABLED = process.env.ENROLLMENT_QUEUE === 'true';
+const WORKER_COUNT = parseInt(process.env.ENROLLMENT_WORKERS) || 2;
+const BATCH_SIZE = parseInt(process.env.ENROLLMENT_BATCH_SIZE) || 50;
+const IDLE_POLL_MS = parseInt(process.env.ENROLLMENT_POLL_MS) || 250;
+const NOTIFY_CHANNEL = 'enrollment_jobs';
+
+// Emits '<ticket>' whenever that job completes
+const outcomes = new EventEmitter();
+outcomes.setMaxListeners(0);
+
+// Wake functions of idle workers, so a new job is picked up immediately
+const sleepingWorkers = new Set();
+let stopping = false;
+// Set once the table, the outcome listener and the workers are all up;
+// until then no ticket may be handed out, nothing would process it
+let running = false;
+
+const wakeWorkers = () => {
+  sleepingWorkers.forEach(wake => wake());
+};
+
+const ensureSchema = async () => {
+  await db.query(`
+    CREATE TABLE IF NOT EXISTS enrollment_jobs (
+      id BIGSERIAL PRIMARY KEY,
+      ticket UUID NOT NULL UNIQUE DEFAULT gen_random_uuid(),
+      user_id INTEGER NOT NULL,
+      course_id INTEGER NOT NULL,
+      status VARCHAR(20) NOT NULL DEFAULT 'pending',
+      result JSONB,
+      attempts INTEGER NOT NULL DEFAULT 0,
+      created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+      completed_at TIMESTAMP
+    )
+  `);
+  await db.query(`
+    CREATE INDEX IF NOT EXISTS idx_enrollment_jobs_pending
+    ON enrollment_jobs (id) WHERE status = 'pending'
+  `);
+};
+
+// Record an enrollment intent and return its ticket
+const enqueueEnrollment = async (user_id, course_id) => {
+  const result = await db.query(`
+    INSERT INTO enrollment_jobs (user_id, course_id)
+    VALUES ($1, $2)
+    RETURNING ticket, status, created_at
+  `, [user_id, course_id]);
+
+  wakeWorkers();
+  return result.rows[0];
+};
+
+// Look up a job; students can only see their own tickets
+const getJob = async (ticket, user_id) => {
+  const result = await db.query(`
+    SELECT ticket, course_id, status, result, created_at, completed_at
+    FROM enrollment_jobs
+    WHERE ticket = $1 AND user_id = $2
+  `, [ticket, user_id]);
+
+  return result.rows[0] || null;
+};
+
+// Resolve once the job has finished or the timeout passes, whichever is first
+const waitForJob = (ticket, user_id, timeoutMs) => {
+  return new Promise((resolve, reject) => {
+    // The initial lookup, the completion event and the timer can all fire;
+    // only the first one answers
+    let done = false;
+    const stopWaiting = () => {
+      if (done) return false;
+      done = true;
+      clearTimeout(timer);
+      outcomes.removeListener(ticket, finish);
+      return true;
+    };
+    const finish = () => {
+      if (stopWaiting()) getJob(ticket, user_id).then(resolve, reject);
+    };
+    const timer = setTimeout(finish, timeoutMs);
+    outcomes.once(ticket, finish);
+
+    // The job may have finished before we subscribed
+    getJob(ticket, user_id).then(job => {
+      if ((!job || job.status !== 'pending') && stopWaiting()) resolve(job);
+    }, (error) => {
+      if (stopWaiting()) reject(error);
+    });
+  });
+};
+
+// Claim and apply one batch. Returns the number of jobs processed.
+const processBatch = async () => {
+  const client = await db.pool.connect();
+  try {
+    await client.query('BEGIN');
+
+    const claimed = await client.query(`
+      SELECT id, ticket, user_id, course_id
+      FROM enrollment_jobs
+      WHERE status = 'pending'
+      ORDER BY id
+      LIMIT $1
+      FOR UPDATE SKIP LOCKED
+    `, [BATCH_SIZE]);
+
+    if (claimed.rows.length === 0) {
+      await client.query('COMMIT');
+      return 0;
+    }
+
+    // Jobs of one student run in submission order, and locking students in
+    // ascending id order keeps concurrent batches from deadlocking
+    const jobs = [...claimed.rows].sort((a, b) => (a.user_id - b.user_id) || (a.id - b.id));
+
+    for (const job of jobs) {
+      await client.query('SELECT pg_advisory_xact_lock($1)', [job.user_id]);
+      await client.query('SAVEPOINT job');
+
+      let outcome;
+      try {
+        outcome = await applyEnrollment(client, job.user_id, job.course_id);
+        await client.query('RELEASE SAVEPOINT job');
+      } catch (error) {
+        // Only this job is rolled back, the rest of the batch still commits
+        await client.query('ROLLBACK TO SAVEPOINT job');
+        console.error('Enrollment job error:', error);
+        outcome = { statusCode: 500, body: { error: 'Failed to enroll in course', message: error.message } };
+      }
+
+      const status = outcome.statusCode < 400 ? 'completed' : 'failed';
+      await client.query(`
+        UPDATE enrollment_jobs
+        SET status = $1, result = $2, attempts = attempts + 1, completed_at = CURRENT_TIMESTAMP
+        WHERE id = $3
+      `, [status, outcome, job.id]);
+      // Delivered on commit, once the outcome is visible to other sessions
+      await client.query('SELECT pg_notify($1, $2)', [NOTIFY_CHANNEL, job.ticket]);
+    }
+
+    await client.query('COMMIT');
+    return jobs.length;
+  } catch (error) {
+    await client.query('ROLLBACK').catch(() => {});
+    throw error;
+  } finally {
+    client.release();
+  }
+};
+
+const runWorker = async (workerId) => {
+  while (!stopping) {
+    try {
+      const processed = await processBatch();
+      if (processed > 0) continue;
+    } catch (error) {
+      console.error(`Enrollment worker ${workerId} error:`, error.message);
+    }
+
+    // Queue is empty (or the DB is unhappy): sleep until woken or the poll interval passes
+    await new Promise(resolve => {
+      const wake = () => {
+        clearTimeout(timer);
+        sleepingWorkers.delete(wake);
+        resolve();
+      };
+      const timer = setTimeout(wake, IDLE_POLL_MS);
+      sleepingWorkers.add(wake);
+    });
+  }
+};
+
+// Create the jobs table, start the outcome listener and the worker pool.
+// Retries until the database is reachable.
+const start = async () => {
+  if (!ENABLED || running) return;
+
+  await retryWithBackoff('Enrollment queue startup', ensureSchema, () => stopping);
+  if (stopping) return;
+  // Forward job completions from every API process to local waiters
+  await db.listen(NOTIFY_CHANNEL, (ticket) => outcomes.emit(ticket));
+  for (let i = 1; i <= WORKER_COUNT; i++) {
+    runWorker(i);
+  }
+  running = true;
+  console.log(`Enrollment queue enabled: ${WORKER_COUNT} workers, batch size ${BATCH_SIZE}`);
+};
+
+const stop = () => {
+  stopping = true;
+  wakeWorkers();
+};
+
+module.exports = {
+  isEnabled: () => ENABLED,
+  isRunning: () => running,
+  start,
+  stop,
+  enqueueEnrollment,
+  getJob,
+  waitForJob
+};
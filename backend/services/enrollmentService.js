@@ -0,0 +1,60 @@
+// Enrollment business rules shared by the synchronous API and the queue workers.
+//
+// `conn` is anything with a pg-style query(text, params) method: the db helper
+// for request-time enrollments, or a checked-out client inside a worker
+// transaction.
+
+// Enroll a user in a course, re-enrolling if they previously dropped it.
+// Returns { statusCode, body } in the same shape the API responds with.
+exports.applyEnrollment = async (conn, user_id, course_id) => {
+  // Check if course exists
+  const courseResult = await conn.query('SELECT id FROM courses WHERE id = $1', [course_id]);
+
+  if (courseResult.rows.length === 0) {
+    return { statusCode: 404, body: { error: 'Course not found' } };
+  }
+
+  // Look up any earlier enrollment (enrolled or dropped) in one query
+  const existing = await conn.query(
+    'SELECT status FROM enrollments WHERE user_id = $1 AND course_id = $2',
+    [user_id, course_id]
+  );
+  const statuses = existing.rows.map(row => row.status);
+
+  if (statuses.includes('enrolled')) {
+    return { statusCode: 400, body: { error: 'Already enrolled in this course' } };
+  }
+
+  if (statuses.includes('dropped')) {
+    // Update from 'dropped' back to 'enrolled'
+    const updateResult = await conn.query(`
+      UPDATE enrollments
+      SET status = 'enrolled', enrollment_date = CURRENT_TIMESTAMP
+      WHERE user_id = $1 AND course_id = $2
+      RETURNING *
+    `, [user_id, course_id]);
+
+    return {
+      statusCode: 200,
+      body: {
+        message: 'Successfully re-enrolled in course',
+        enrollment: updateResult.rows[0]
+      }
+    };
+  }
+
+  // New enrollment
+  const result = await conn.query(`
+    INSERT INTO enrollments (user_id, course_id, status)
+    VALUES ($1, $2, 'enrolled')
+    RETURNING *
+  `, [user_id, course_id]);
+
+  return {
+    statusCode: 201,
+    body: {
+      message: 'Successfully enrolled in course',
+      enrollment: result.rows[0]
+    }
+  };
+};
@@ -0,0 +1,158 @@
+const db = require('../config/db');
+const { retryWithBackoff } = require('../utils/retry');
+
+// Live seat counts over Server-Sent Events.
+//
+// Statement-level triggers on enrollments publish one
+// "<course_id>:<delta>:<xid>:<nonce>" NOTIFY per touched course on the
+// seat_counts channel. Because they run inside the writing transaction, only
+// committed changes are announced, and every writer is covered - API
+// enroll/drop, queue workers, course deletes cascading to enrollments and the
+// semester rollover - without an extra round trip. The nonce keeps Postgres
+// from folding identical payloads sent in one transaction (e.g. two
+// enrollments in the same queue batch) into one.
+//
+// Every API process listens, sums the deltas per writing transaction and
+// course, and pushes them to its subscribers a few times a second as one event:
+//
+//   event: seats
+//   data: {"<xid>":{"12":1,"15":-1},"<xid>":{"12":1}}
+//
+// The transaction id lets a client that loaded the catalog meanwhile tell
+// which changes it already has: catalog responses carry the snapshot they
+// were read under (seat_snapshot), and a change is included in it exactly
+// when its transaction was visible to that snapshot.
+const NOTIFY_CHANNEL = 'seat_counts';
+const FLUSH_INTERVAL_MS = parseInt(process.env.SEAT_EVENTS_FLUSH_MS) || 250;
+const HEARTBEAT_INTERVAL_MS = 25000;
+const MAX_SUBSCRIBERS = parseInt(process.env.SEAT_EVENTS_MAX_CLIENTS) || 5000;
+
+const subscribers = new Set();
+
+// xid -> (course_id -> net change) since the last flush
+const pendingDeltas = new Map();
+
+// starting: start() is in progress; started: triggers, LISTEN and the flush
+// timers are all up. live: the LISTEN connection is currently up - while it
+// is down deltas are lost, so no subscriber is accepted or kept.
+let starting = false;
+let started = false;
+let live = false;
+
+// Net change in 'enrolled' rows per course for the statement that fired the
+// trigger. Transition tables can only belong to single-event triggers, so one
+// function backs three triggers; PL/pgSQL plans a statement on first run, so
+// each branch only touches the tables its event has.
+const ensureTriggers = async () => {
+  await db.query(`
+    CREATE OR REPLACE FUNCTION notify_seat_counts() RETURNS trigger AS $$
+    BEGIN
+      IF TG_OP = 'INSERT' THEN
+        PERFORM pg_notify('${NOTIFY_CHANNEL}',
+          concat_ws(':', course_id, COUNT(*), pg_current_xact_id(), gen_random_uuid()))
+        FROM new_rows WHERE status = 'enrolled' GROUP BY course_id;
+      ELSIF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('${NOTIFY_CHANNEL}',
+          concat_ws(':', course_id, -COUNT(*), pg_current_xact_id(), gen_random_uuid()))
+        FROM old_rows WHERE status = 'enrolled' GROUP BY course_id;
+      ELSE
+        PERFORM pg_notify('${NOTIFY_CHANNEL}',
+          concat_ws(':', course_id, SUM(delta), pg_current_xact_id(), gen_random_uuid()))
+        FROM (
+          SELECT course_id, 1 AS delta FROM new_rows WHERE status = 'enrolled'
+          UNION ALL
+          SELECT course_id, -1 AS delta FROM old_rows WHERE status = 'enrolled'
+        ) changes
+        GROUP BY course_id
+        HAVING SUM(delta) <> 0;
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+  `);
+  await db.query(`
+    CREATE OR REPLACE TRIGGER seat_counts_insert AFTER INSERT ON enrollments
+      REFERENCING NEW TABLE AS new_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION notify_seat_counts();
+    CREATE OR REPLACE TRIGGER seat_counts_update AFTER UPDATE ON enrollments
+      REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION notify_seat_counts();
+    CREATE OR REPLACE TRIGGER seat_counts_delete AFTER DELETE ON enrollments
+      REFERENCING OLD TABLE AS old_rows
+      FOR EACH STATEMENT EXECUTE FUNCTION notify_seat_counts();
+  `);
+};
+
+const broadcast = (chunk) => {
+  subscribers.forEach(res => res.write(chunk));
+};
+
+const flush = () => {
+  if (pendingDeltas.size === 0) return;
+
+  const changes = {};
+  pendingDeltas.forEach((courses, xid) => {
+    const deltas = {};
+    courses.forEach((delta, course_id) => {
+      if (delta !== 0) deltas[course_id] = delta;
+    });
+    if (Object.keys(deltas).length > 0) changes[xid] = deltas;
+  });
+  pendingDeltas.clear();
+
+  if (Object.keys(changes).length > 0) {
+    broadcast(`event: seats\ndata: ${JSON.stringify(changes)}\n\n`);
+  }
+};
+
+const onNotification = (payload) => {
+  // The trailing nonce is only there for Postgres, ignore it
+  const [course_id, delta, xid] = payload.split(':');
+  if (!pendingDeltas.has(xid)) pendingDeltas.set(xid, new Map());
+  const courses = pendingDeltas.get(xid);
+  courses.set(course_id, (courses.get(course_id) || 0) + parseInt(delta));
+};
+
+const onFeedStateChange = (up) => {
+  live = up;
+  if (up) return;
+
+  // Changes made while we can't hear them never arrive: end the streams so
+  // clients know their counts are no longer live
+  pendingDeltas.clear();
+  subscribers.forEach(res => res.end());
+  subscribers.clear();
+};
+
+// Whether live seat changes are flowing right now
+const isLive = () => started && live;
+
+// Register an SSE response. Returns false if we are at the subscriber limit.
+const addSubscriber = (res) => {
+  if (subscribers.size >= MAX_SUBSCRIBERS) return false;
+
+  subscribers.add(res);
+  res.on('close', () => subscribers.delete(res));
+  return true;
+};
+
+// Install the triggers, start listening for seat changes and flushing them.
+// Retries until the database is reachable.
+const start = async () => {
+  if (starting || started) return;
+  starting = true;
+
+  await retryWithBackoff('Seat count triggers', ensureTriggers);
+  await db.listen(NOTIFY_CHANNEL, onNotification, onFeedStateChange);
+  setInterval(flush, FLUSH_INTERVAL_MS).unref();
+  // Comment lines keep idle connections open through proxies
+  setInterval(() => broadcast(': ping\n\n'), HEARTBEAT_INTERVAL_MS).unref();
+  started = true;
+};
+
+module.exports = {
+  start,
+  isLive,
+  addSubscriber,
+  getSubscriberCount: () => subscribers.size
+};
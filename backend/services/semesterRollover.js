@@ -0,0 +1,263 @@
+const db = require('../config/db');
+
+// End-of-semester rollover.
+//
+// Moves a semester's rows out of the live enrollments table in chunks: each
+// chunk is one set-based DELETE ... RETURNING feeding an INSERT into
+// enrollments_archive (partitioned by academic session), with 'enrolled' rows
+// becoming 'completed' and dropped rows archived as history. The job row is
+// updated in the same transaction, so progress is exact and a job that was
+// interrupted resumes where it stopped. The live table then only holds the
+// current semester, which keeps the hot status = 'enrolled' queries small.
+//
+// Courses carry a semester number but no academic session, so rows are
+// selected by semester plus an explicit cutoff (the semester's end date):
+// only enrollments made before it are archived. The session is just the
+// label - and partition - they are archived under.
+const DEFAULT_CHUNK_SIZE = parseInt(process.env.ROLLOVER_CHUNK_SIZE) || 5000;
+const SESSION_PATTERN = /^(\d{4})\/(\d{4})$/;
+// A date, optionally with a time: 2025-01-31 or 2025-01-31T18:00[:00]
+const CUTOFF_PATTERN = /^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2})?)?$/;
+
+// A running job refreshes its heartbeat every chunk. If it stops for this
+// long (process died), another call may take it over and resume it. Each
+// claim gets a new runner token, and every chunk first checks the token, so a
+// runner that was only slow (e.g. a chunk waiting on row locks) notices the
+// takeover and stops instead of advancing the job alongside the new one.
+const LEASE_SECONDS = 60;
+
+const ensureSchema = async () => {
+  await db.query(`
+    CREATE TABLE IF NOT EXISTS enrollments_archive (
+      id INTEGER NOT NULL,
+      user_id INTEGER NOT NULL,
+      course_id INTEGER NOT NULL,
+      status VARCHAR(20) NOT NULL,
+      enrollment_date TIMESTAMP,
+      session VARCHAR(9) NOT NULL,
+      semester INTEGER NOT NULL,
+      archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+      PRIMARY KEY (session, id)
+    ) PARTITION BY LIST (session)
+  `);
+  await db.query(`
+    CREATE TABLE IF NOT EXISTS rollover_jobs (
+      id SERIAL PRIMARY KEY,
+      session VARCHAR(9) NOT NULL,
+      semester INTEGER NOT NULL,
+      cutoff TIMESTAMP NOT NULL,
+      chunk_size INTEGER NOT NULL,
+      status VARCHAR(20) NOT NULL DEFAULT 'pending',
+      total_rows BIGINT NOT NULL DEFAULT 0,
+      moved_rows BIGINT NOT NULL DEFAULT 0,
+      completed_rows BIGINT NOT NULL DEFAULT 0,
+      last_id INTEGER NOT NULL DEFAULT 0,
+      error TEXT,
+      created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+      heartbeat_at TIMESTAMP,
+      runner UUID,
+      finished_at TIMESTAMP,
+      UNIQUE (session, semester)
+    )
+  `);
+  // Tables created before runner tokens existed
+  await db.query('ALTER TABLE rollover_jobs ADD COLUMN IF NOT EXISTS runner UUID');
+};
+
+// Create the tables on first use. The promise is kept once it succeeds, so
+// status polls don't repeat the DDL; a failed attempt is retried next call.
+let schemaReady = null;
+const ensureSchemaOnce = () => {
+  if (!schemaReady) {
+    schemaReady = ensureSchema().catch((error) => {
+      schemaReady = null;
+      throw error;
+    });
+  }
+  return schemaReady;
+};
+
+// One archive partition per session, e.g. enrollments_archive_2024_2025
+const ensurePartition = async (session) => {
+  const [, startYear, endYear] = session.match(SESSION_PATTERN);
+  await db.query(`
+    CREATE TABLE IF NOT EXISTS enrollments_archive_${startYear}_${endYear}
+    PARTITION OF enrollments_archive FOR VALUES IN ('${session}')
+  `);
+};
+
+// Take the job if nobody else is running it (or its runner stopped heartbeating)
+const claimJob = async (jobId) => {
+  const result = await db.query(`
+    UPDATE rollover_jobs
+    SET status = 'running', heartbeat_at = CURRENT_TIMESTAMP, error = NULL, runner = gen_random_uuid()
+    WHERE id = $1
+      AND (status IN ('pending', 'failed')
+           OR (status = 'running' AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => $2)))
+    RETURNING *
+  `, [jobId, LEASE_SECONDS]);
+
+  return result.rows[0] || null;
+};
+
+// Archive one chunk in a single transaction. Returns the number of rows moved,
+// or null if another runner has taken the job over.
+const processChunk = async (job) => {
+  const client = await db.pool.connect();
+  try {
+    await client.query('BEGIN');
+
+    // Still ours? This also locks the job row until commit, so a takeover
+    // waits for this chunk instead of running next to it
+    const owned = await client.query(`
+      UPDATE rollover_jobs
+      SET heartbeat_at = CURRENT_TIMESTAMP
+      WHERE id = $1 AND runner = $2 AND status = 'running'
+      RETURNING last_id
+    `, [job.id, job.runner]);
+
+    if (owned.rows.length === 0) {
+      await client.query('ROLLBACK');
+      return null;
+    }
+    job.last_id = owned.rows[0].last_id;
+
+    const moved = await client.query(`
+      WITH batch AS (
+        SELECT e.id
+        FROM enrollments e
+        JOIN courses c ON c.id = e.course_id
+        WHERE c.semester = $1
+          AND e.enrollment_date < (SELECT cutoff FROM rollover_jobs WHERE id = $2)
+          AND e.id > $3
+        ORDER BY e.id
+        LIMIT $4
+        FOR UPDATE OF e
+      ), removed AS (
+        DELETE FROM enrollments e
+        USING batch
+        WHERE e.id = batch.id
+        RETURNING e.id, e.user_id, e.course_id, e.status, e.enrollment_date
+      )
+      INSERT INTO enrollments_archive (id, user_id, course_id, status, enrollment_date, session, semester)
+      SELECT id, user_id, course_id,
+             CASE WHEN status = 'enrolled' THEN 'completed' ELSE status END,
+             enrollment_date, $5, $1
+      FROM removed
+      RETURNING id, status
+    `, [job.semester, job.id, job.last_id, job.chunk_size, job.session]);
+
+    const rows = moved.rows;
+    if (rows.length > 0) {
+      const lastId = rows.reduce((max, row) => Math.max(max, row.id), job.last_id);
+      const completed = rows.filter(row => row.status === 'completed');
+
+      await client.query(`
+        UPDATE rollover_jobs
+        SET moved_rows = moved_rows + $1, completed_rows = completed_rows + $2,
+            last_id = $3, heartbeat_at = clock_timestamp()
+        WHERE id = $4
+      `, [rows.length, completed.length, lastId, job.id]);
+
+      job.last_id = lastId;
+    }
+
+    await client.query('COMMIT');
+    return rows.length;
+  } catch (error) {
+    await client.query('ROLLBACK').catch(() => {});
+    throw error;
+  } finally {
+    client.release();
+  }
+};
+
+// Run (or resume) a claimed job until no rows are left
+const runJob = async (job) => {
+  console.log(`Rollover ${job.session} semester ${job.semester}: resuming after id ${job.last_id}`);
+  try {
+    await ensurePartition(job.session);
+
+    let moved;
+    do {
+      moved = await processChunk(job);
+      if (moved === null) {
+        console.log(`Rollover ${job.session} semester ${job.semester}: taken over by another runner, stopping`);
+        return;
+      }
+      if (moved > 0) {
+        const progress = await getJob(job.id);
+        console.log(`Rollover ${job.session} semester ${job.semester}: ` +
+          `${progress.moved_rows}/${progress.total_rows} rows archived`);
+      }
+    } while (moved > 0);
+
+    await db.query(`
+      UPDATE rollover_jobs
+      SET status = 'completed', finished_at = CURRENT_TIMESTAMP
+      WHERE id = $1 AND runner = $2
+    `, [job.id, job.runner]);
+    await db.query('ANALYZE enrollments');
+    console.log(`Rollover ${job.session} semester ${job.semester}: completed`);
+  } catch (error) {
+    console.error('Rollover error:', error);
+    await db.query(
+      `UPDATE rollover_jobs SET status = 'failed', error = $1 WHERE id = $2 AND runner = $3`,
+      [error.message, job.id, job.runner]
+    ).catch(() => {});
+  }
+};
+
+// Create (or find) the job for a session/semester and start it in the background.
+// Calling this again for a failed or interrupted job resumes it. A job keeps
+// the cutoff it was created with; asking for a different one is a conflict.
+// Returns { job, cutoffConflict }.
+const startRollover = async ({ session, semester, cutoff, chunkSize }) => {
+  await ensureSchemaOnce();
+
+  const result = await db.query(`
+    INSERT INTO rollover_jobs (session, semester, cutoff, chunk_size, total_rows)
+    SELECT $1, $2, $3::timestamp, $4, COUNT(*)
+    FROM enrollments e
+    JOIN courses c ON c.id = e.course_id
+    WHERE c.semester = $2 AND e.enrollment_date < $3::timestamp
+    ON CONFLICT (session, semester) DO NOTHING
+    RETURNING id
+  `, [session, semester, cutoff, chunkSize || DEFAULT_CHUNK_SIZE]);
+
+  let jobId;
+  if (result.rows.length > 0) {
+    jobId = result.rows[0].id;
+  } else {
+    const existing = await db.query(`
+      SELECT id, cutoff = $3::timestamp AS same_cutoff
+      FROM rollover_jobs
+      WHERE session = $1 AND semester = $2
+    `, [session, semester, cutoff]);
+    jobId = existing.rows[0].id;
+
+    if (!existing.rows[0].same_cutoff) {
+      return { job: await getJob(jobId), cutoffConflict: true };
+    }
+  }
+
+  const claimed = await claimJob(jobId);
+  if (claimed) {
+    runJob(claimed);
+  }
+  return { job: await getJob(jobId), cutoffConflict: false };
+};
+
+const getJob = async (jobId) => {
+  // A database that never had a rollover has no jobs table yet
+  await ensureSchemaOnce();
+  const result = await db.query('SELECT * FROM rollover_jobs WHERE id = $1', [jobId]);
+  return result.rows[0] || null;
+};
+
+module.exports = {
+  SESSION_PATTERN,
+  CUTOFF_PATTERN,
+  startRollover,
+  getJob
+};
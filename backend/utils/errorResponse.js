@@ -0,0 +1,11 @@
+const { isPoolTimeout } = require('../config/db');
+const { sendBusy } = require('../middleware/loadShedding');
+
+// Answer a failed request. Running out of pool clients is overload, not a
+// bug, so it gets 503 + Retry-After; anything else is the usual 500.
+exports.sendError = (res, error, message) => {
+  if (isPoolTimeout(error)) {
+    return sendBusy(res);
+  }
+  return res.status(500).json({ error: message, message: error.message });
+};
@@ -0,0 +1,6 @@
+const MAX_INTEGER_ID = 2147483647;
+
+// Ids are positive Postgres INTEGERs; anything else can't name a row
+exports.isValidId = (value) => {
+  return /^\d+$/.test(String(value)) && Number(value) > 0 && Number(value) <= MAX_INTEGER_ID;
+};
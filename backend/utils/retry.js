@@ -0,0 +1,19 @@
+// Run an async startup step until it succeeds, backing off between attempts
+// (1s, 2s, 4s ... capped). Used for work that needs the database at boot,
+// which may still be starting up (docker-compose doesn't wait for it).
+const INITIAL_DELAY_MS = 1000;
+const MAX_DELAY_MS = 30000;
+
+exports.retryWithBackoff = async (name, fn, shouldStop = () => false) => {
+  let delay = INITIAL_DELAY_MS;
+  while (!shouldStop()) {
+    try {
+      return await fn();
+    } catch (error) {
+      console.error(`${name} failed, retrying in ${delay / 1000}s:`, error.message);
+      await new Promise(resolve => setTimeout(resolve, delay));
+      delay = Math.min(delay * 2, MAX_DELAY_MS);
+    }
+  }
+  return undefined;
+};
@@ -0,0 +1,8 @@
+// Route template of a request, e.g. /api/courses/:id, when a route matched;
+// otherwise the path without the query string. Routes mounted as '/' would
+// come out as '/api/courses/', so the trailing slash is dropped to keep one
+// name per endpoint.
+exports.getRouteTemplate = (req) => {
+  if (!req.route) return req.originalUrl.split('?')[0];
+  return (req.baseUrl + req.route.path).replace(/(.)\/$/, '$1');
+};
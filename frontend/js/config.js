@@ -59,6 +59,48 @@ async function apiRequest(url, options = {}) {
     return response;
 }
 
+// Helper function to subscribe to live seat count changes.
+// onChange(xid, { course_id: delta, ... }) is called once per writing
+// transaction. Changes made while the stream was down are lost, so onResync
+// is called whenever it (re)connects after a failure; pages refetch counts
+// then. If the server refuses the stream (503) we try again later.
+const SEAT_STREAM_RETRY_MS = 10000;
+
+function subscribeSeatCounts(onChange, onResync) {
+    if (!window.EventSource) return;
+    
+    let needsResync = false;
+    const connect = () => {
+        const source = new EventSource(`${API_BASE_URL}/events/seats`);
+        source.addEventListener('open', () => {
+            if (needsResync && onResync) onResync();
+            needsResync = false;
+        });
+        source.addEventListener('seats', (event) => {
+            Object.entries(JSON.parse(event.data)).forEach(([xid, deltas]) => onChange(xid, deltas));
+        });
+        source.addEventListener('error', () => {
+            needsResync = true;
+            // EventSource retries dropped streams itself, but not refused ones
+            if (source.readyState === EventSource.CLOSED) {
+                setTimeout(connect, SEAT_STREAM_RETRY_MS);
+            }
+        });
+    };
+    connect();
+}
+
+// Whether a seat change from transaction xid is already included in a catalog
+// response read under snapshot ("xmin:xmax:xip,..." from seat_snapshot): it
+// is when the transaction had committed before the snapshot was taken
+function seenBySnapshot(xid, snapshot) {
+    const [xmin, xmax, inProgress] = snapshot.split(':');
+    const id = Number(xid);
+    if (id < Number(xmin)) return true;
+    if (id >= Number(xmax)) return false;
+    return !(inProgress ? inProgress.split(',') : []).includes(String(id));
+}
+
 // Helper function to show error messages
 function showError(elementId, message) {
     const errorEl = document.getElementById(elementId);
@@ -10,6 +10,9 @@ let allCourses = [];
 let enrolledCourseIds = [];
 let enrolledCourses = [];
 let selectedCourse = null;
+// Seat count changes received while the catalog is loading, as [xid, deltas];
+// null once loaded
+let pendingSeatDeltas = [];
 const MAX_CREDITS = 24;
 
 // Load all courses
@@ -25,6 +28,9 @@ async function loadCourses() {
         
         console.log('Loading courses from API...');
         
+        // Buffer live seat changes until the new catalog is in place
+        pendingSeatDeltas = [];
+        
         // Load courses for student's level only
         const coursesResponse = await fetch(`${API_BASE_URL}/courses?level=${user.level}`);
         console.log('Courses response status:', coursesResponse.status);
@@ -37,6 +43,9 @@ async function loadCourses() {
         console.log('Courses data:', coursesData);
         allCourses = coursesData.courses || [];
         
+        // Catch up on changes that arrived while the catalog was loading
+        replayBufferedSeatDeltas(coursesData.seat_snapshot);
+        
         // Load enrolled courses
         const enrolledResponse = await apiRequest('/enrollments/my-courses');
         console.log('Enrolled response status:', enrolledResponse.status);
@@ -58,6 +67,7 @@ async function loadCourses() {
         updateCreditDisplay();
     } catch (error) {
         console.error('Failed to load courses:', error);
+        pendingSeatDeltas = null;
         const loadingElement = document.getElementById('loading');
         if (loadingElement) loadingElement.classList.add('hidden');
         showToast('Failed to load courses. Please check console for details.', 'error');
@@ -179,6 +189,10 @@ function displayCourses(courses) {
                                 <i class="fas fa-layer-group text-purple-500"></i>
                                 <span>Level ${course.level}</span>
                             </div>
+                            <div class="flex items-center gap-2">
+                                <i class="fas fa-users text-green-500"></i>
+                                <span data-seat-count="${course.id}">${parseInt(course.enrolled_students) || 0} enrolled</span>
+                            </div>
                         </div>
                     </div>
                     
@@ -336,9 +350,19 @@ async function confirmEnrollment() {
             body: JSON.stringify({ course_id: selectedCourse.id })
         });
 
-        const data = await response.json();
+        let data = await response.json();
         
-        if (!response.ok) {
+        // Queued enrollment mode: wait for the background worker's outcome
+        if (response.status === 202) {
+            showToast(`Enrollment in ${selectedCourse.course_code} is being processed...`, 'info');
+            const result = await waitForEnrollmentJob(data.ticket);
+            data = result.body;
+            if (result.statusCode >= 400) {
+                showToast(data.error || 'Enrollment failed', 'error');
+                closeModal();
+                return;
+            }
+        } else if (!response.ok) {
             showToast(data.error || 'Enrollment failed', 'error');
             closeModal();
             return;
@@ -357,6 +381,23 @@ async function confirmEnrollment() {
     }
 }
 
+// Long-poll a queued enrollment until a worker has applied it
+async function waitForEnrollmentJob(ticket) {
+    for (let attempt = 0; attempt < 10; attempt++) {
+        const response = await apiRequest(`/enrollments/jobs/${ticket}?wait=20`);
+        const data = await response.json();
+        
+        if (!response.ok) {
+            throw new Error(data.error || 'Failed to fetch enrollment status');
+        }
+        
+        if (data.job.status !== 'pending') {
+            return data.job.result;
+        }
+    }
+    throw new Error('Enrollment is taking longer than expected');
+}
+
 // Helper function to reload courses without loading state
 async function reloadCoursesSilently() {
     try {
@@ -382,6 +423,67 @@ async function reloadCoursesSilently() {
     }
 }
 
+// Live seat count change from transaction xid; held back while the catalog loads
+function onSeatChange(xid, deltas) {
+    if (pendingSeatDeltas) {
+        pendingSeatDeltas.push([xid, deltas]);
+        return;
+    }
+    applySeatDeltas(deltas);
+}
+
+// Apply the changes buffered during a catalog fetch, except those its
+// snapshot already counted
+function replayBufferedSeatDeltas(snapshot) {
+    const buffered = pendingSeatDeltas || [];
+    pendingSeatDeltas = null;
+    buffered
+        .filter(([xid]) => !snapshot || !seenBySnapshot(xid, snapshot))
+        .forEach(([, deltas]) => applySeatDeltas(deltas));
+}
+
+// Refetch seat counts after the live stream was interrupted
+async function refreshSeatCounts() {
+    try {
+        pendingSeatDeltas = [];
+        const response = await fetch(`${API_BASE_URL}/courses?level=${user.level}`);
+        if (!response.ok) throw new Error('Failed to fetch courses');
+        
+        const data = await response.json();
+        const counts = new Map((data.courses || []).map(c => [c.id, c.enrolled_students]));
+        allCourses.forEach(course => {
+            if (counts.has(course.id)) {
+                // Reset to the snapshot value, the replay below adds what came after
+                course.enrolled_students = counts.get(course.id);
+                renderSeatCount(course);
+            }
+        });
+        replayBufferedSeatDeltas(data.seat_snapshot);
+    } catch (error) {
+        console.error('Failed to refresh seat counts:', error);
+        replayBufferedSeatDeltas(null);
+    }
+}
+
+// Apply live seat count changes in place, without refetching the catalog
+function applySeatDeltas(deltas) {
+    Object.entries(deltas).forEach(([courseId, delta]) => {
+        const course = allCourses.find(c => c.id === parseInt(courseId));
+        if (!course) return;
+        
+        course.enrolled_students = Math.max(0, (parseInt(course.enrolled_students) || 0) + delta);
+        renderSeatCount(course);
+    });
+}
+
+// Show a course's current seat count on its card, if it is displayed
+function renderSeatCount(course) {
+    const countElement = document.querySelector(`[data-seat-count="${course.id}"]`);
+    if (countElement) {
+        countElement.textContent = `${parseInt(course.enrolled_students) || 0} enrolled`;
+    }
+}
+
 // Premium Toast notification function
 function showToast(message, type = 'info') {
     const existingToasts = document.querySelectorAll('.toast-notification');
@@ -465,5 +567,7 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log('Initializing courses page...');
     console.log('API_BASE_URL:', API_BASE_URL);
     console.log('User:', user);
+    // Subscribe first so no change is missed while the catalog loads
+    subscribeSeatCounts(onSeatChange, refreshSeatCounts);
     loadCourses();
 });
\ No newline at end of file
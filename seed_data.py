@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Seeder - Generate institution-sized data for scale testing
+Run with: python3 seed_data.py --students 1000000 --seed 42
+
+Courses are modeled on frontend/js/courses-data.js, students are spread
+across levels 100-400 and enrollments are bulk-loaded into PostgreSQL with
+COPY from parallel worker processes. The same --seed always produces the
+same rows, no matter how many workers are used.
+"""
+
+import argparse
+import io
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+
+COURSES_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 'frontend', 'js', 'courses-data.js')
+
+LEVELS = [100, 200, 300, 400]
+
+# Fewer students in the upper levels, like a real department after attrition
+DEFAULT_LEVEL_WEIGHTS = [0.30, 0.27, 0.23, 0.20]
+
+# Matches MAX_CREDITS in frontend/js/courses.js
+MAX_CREDITS = 24
+
+FIRST_NAMES = ['John', 'Mary', 'Chinedu', 'Ngozi', 'Emeka', 'Aisha', 'Tunde', 'Blessing',
+               'David', 'Grace', 'Ibrahim', 'Fatima', 'Samuel', 'Joy', 'Daniel', 'Esther',
+               'Uche', 'Funmi', 'Peter', 'Amaka', 'Musa', 'Ruth', 'Kelechi', 'Zainab']
+LAST_NAMES = ['Doe', 'Okafor', 'Adeyemi', 'Bello', 'Eze', 'Ibe', 'Okonkwo', 'Balogun',
+              'Nwosu', 'Abubakar', 'Obi', 'Ogunleye', 'Danjuma', 'Amadi', 'Yusuf', 'Iroha']
+
+# bcrypt hash used for every seeded account when the bcrypt module is missing.
+# It never matches a password, so seeded users cannot log in unless --password
+# is hashed with bcrypt installed.
+UNUSABLE_PASSWORD_HASH = '$2a$10$' + '.' * 53
+
+
+def print_info(message):
+    """Print informational message"""
+    print(f"📘 {message}")
+
+
+def print_warning(message):
+    """Print warning message"""
+    print(f"⚠️  {message}")
+
+
+def load_catalog(path=COURSES_DATA_FILE):
+    """Parse the course catalog out of courses-data.js"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+
+    catalog = {}
+    level = None
+    semester = None
+    for line in source.splitlines():
+        level_match = re.match(r"\s*'(\d{3})':\s*{", line)
+        if level_match:
+            level = int(level_match.group(1))
+            continue
+        semester_match = re.match(r"\s*'([12])':\s*\[", line)
+        if semester_match:
+            semester = int(semester_match.group(1))
+            continue
+        course_match = re.search(
+            r"code:\s*'([^']+)',\s*title:\s*'([^']+)',\s*credits:\s*(\d+)", line)
+        if course_match and level and semester:
+            catalog.setdefault((level, semester), []).append({
+                'course_code': course_match.group(1),
+                'course_name': course_match.group(2),
+                'credits': int(course_match.group(3)),
+                'level': level,
+                'semester': semester,
+            })
+    return catalog
+
+
+def expand_sections(catalog, sections):
+    """Duplicate every catalog course into N sections (section 1 keeps the real code)"""
+    courses = []
+    for (level, semester), entries in sorted(catalog.items()):
+        for entry in entries:
+            for section in range(1, sections + 1):
+                course = dict(entry)
+                if section > 1:
+                    course['course_code'] = f"{entry['course_code']}-S{section}"
+                    course['course_name'] = f"{entry['course_name']} (Section {section})"
+                course['base_code'] = entry['course_code']
+                courses.append(course)
+    return courses
+
+
+def chunk_rng(seed, kind, index):
+    """Independent, reproducible RNG per chunk so results don't depend on worker count"""
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def student_level(rng, weights):
+    """Pick a level for a student using the configured distribution"""
+    return rng.choices(LEVELS, weights=weights)[0]
+
+
+def generate_students(job):
+    """Generate one chunk of users as COPY text, returning (buffer, rows, enrollment rows)"""
+    seed = job['seed']
+    tag = job['tag']
+    first_id = job['first_id']
+    start, end = job['start'], job['end']
+    courses_by_level = job['courses_by_level']
+    drop_rate = job['drop_rate']
+    max_credits = job['max_credits']
+    term_start = job['term_start']
+
+    rng = chunk_rng(seed, 'students', job['index'])
+    users = io.StringIO()
+    enrollments = io.StringIO()
+    enrollment_count = 0
+
+    for n in range(start, end):
+        user_id = first_id + n
+        level = student_level(rng, job['level_weights'])
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        created_at = term_start - timedelta(days=rng.randint(0, 365 * (level // 100)))
+        users.write(
+            f"{user_id}\t{first.lower()}.{last.lower()}.{tag}.{n}@student.uniport.edu\t"
+            f"{job['password_hash']}\t{first} {last}\t{tag.upper()}{n:08d}\t"
+            f"+23480{rng.randint(10000000, 99999999)}\tstudent\t{level}\t"
+            f"{created_at.isoformat(sep=' ')}\n"
+        )
+
+        # One section per base course, in random order, until the credit limit is hit.
+        # Dropped courses don't count against the limit, so drops add extra rows.
+        offered = courses_by_level[level]
+        candidates = [rng.choice(sections) for sections in offered]
+        rng.shuffle(candidates)
+        credits = 0
+        for course_id, course_credits in candidates:
+            if credits + course_credits > max_credits:
+                continue
+            status = 'dropped' if rng.random() < drop_rate else 'enrolled'
+            if status == 'enrolled':
+                credits += course_credits
+            enrolled_at = term_start + timedelta(seconds=rng.randint(0, 14 * 24 * 3600))
+            enrollments.write(
+                f"{user_id}\t{course_id}\t{status}\t{enrolled_at.isoformat(sep=' ')}\n")
+            enrollment_count += 1
+
+    return users.getvalue(), end - start, enrollments.getvalue(), enrollment_count
+
+
+def connect(args):
+    """Open a PostgreSQL connection using the same settings as backend/config/db.js"""
+    try:
+        import psycopg2
+    except ImportError:
+        print_warning("psycopg2 is required for loading data: pip install psycopg2-binary")
+        sys.exit(1)
+
+    return psycopg2.connect(
+        host=args.host, port=args.port, user=args.user,
+        password=args.password_db, dbname=args.database)
+
+
+def copy_chunk(job):
+    """Worker: generate a chunk and COPY it into users and enrollments"""
+    users, user_rows, enrollments, enrollment_rows = generate_students(job)
+    if job['dry_run']:
+        return user_rows, enrollment_rows
+
+    conn = connect(job['args'])
+    try:
+        with conn.cursor() as cur:
+            # Seeded data can always be regenerated from the seed
+            cur.execute("SET synchronous_commit = off")
+            cur.copy_expert(
+                "COPY users (id, email, password, full_name, student_id, phone, role, level, "
+                "created_at) FROM STDIN", io.StringIO(users))
+            cur.copy_expert(
+                "COPY enrollments (user_id, course_id, status, enrollment_date) FROM STDIN",
+                io.StringIO(enrollments))
+        conn.commit()
+    finally:
+        conn.close()
+    return user_rows, enrollment_rows
+
+
+def ensure_courses(args, courses):
+    """Insert any missing catalog courses and return {course_code: id}"""
+    if args.dry_run:
+        return {course['course_code']: i + 1 for i, course in enumerate(courses)}
+
+    conn = connect(args)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT course_code, id FROM courses")
+            ids = dict(cur.fetchall())
+            for course in courses:
+                if course['course_code'] in ids:
+                    continue
+                cur.execute(
+                    """INSERT INTO courses (course_code, course_name, credits, level, semester)
+                       VALUES (%s, %s, %s, %s, %s) RETURNING id""",
+                    (course['course_code'], course['course_name'], course['credits'],
+                     course['level'], course['semester']))
+                ids[course['course_code']] = cur.fetchone()[0]
+        conn.commit()
+    finally:
+        conn.close()
+    return ids
+
+
+def like_escape(text):
+    """Escape LIKE wildcards so text matches literally"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def check_not_seeded(args):
+    """Stop before loading anything if this tag was already seeded.
+
+    Chunks commit independently, so a duplicate email or student ID would only
+    fail inside one worker after other chunks had committed, leaving a partial
+    load behind.
+    """
+    if args.dry_run:
+        return
+
+    tag = like_escape(args.tag)
+    conn = connect(args)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT COUNT(*) FROM users WHERE email LIKE %s OR student_id LIKE %s",
+                (f"%.{tag}.%@student.uniport.edu", f"{tag.upper()}{'_' * 8}"))
+            existing = cur.fetchone()[0]
+    finally:
+        conn.close()
+
+    if existing:
+        print_warning(f"{existing:,} users with tag '{args.tag}' already exist - "
+                      f"pick another --tag or --seed, or remove them first")
+        sys.exit(1)
+
+
+def reserve_user_ids(args):
+    """Reserve a block of users.id values and return the first one.
+
+    Ids are assigned up front so enrollments need no lookups. The users table
+    is locked while the sequence is moved past the block, so registrations made
+    during the seed get ids after it instead of colliding with seeded rows.
+    """
+    if args.dry_run:
+        return 1
+
+    conn = connect(args)
+    try:
+        with conn.cursor() as cur:
+            # Blocks inserts (and their nextval) until commit; reads still run
+            cur.execute("LOCK TABLE users IN EXCLUSIVE MODE")
+            cur.execute(
+                "SELECT GREATEST(COALESCE(MAX(id), 0) + 1, "
+                "nextval(pg_get_serial_sequence('users', 'id'))) FROM users")
+            first_id = cur.fetchone()[0]
+            cur.execute(
+                "SELECT setval(pg_get_serial_sequence('users', 'id'), %s, false)",
+                (first_id + args.students,))
+        conn.commit()
+    finally:
+        conn.close()
+    return first_id
+
+
+def finish_load(args):
+    """Refresh planner statistics for the loaded tables"""
+    if args.dry_run:
+        return
+
+    conn = connect(args)
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE users")
+            cur.execute("ANALYZE enrollments")
+    finally:
+        conn.close()
+
+
+def password_hash(password):
+    """Hash the shared seed password once; bcrypt per user would dominate the run time"""
+    try:
+        import bcrypt
+    except ImportError:
+        print_warning("bcrypt not installed - seeded accounts will not be able to log in")
+        return UNUSABLE_PASSWORD_HASH
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(10)).decode()
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Seed synthetic institution data into PostgreSQL")
+    parser.add_argument('--students', type=int, default=10000, help="number of students to create")
+    parser.add_argument('--seed', type=int, default=42, help="random seed (same seed, same data)")
+    parser.add_argument('--tag', default=None,
+                        help="prefix for emails/student IDs (default: seed<seed>)")
+    parser.add_argument('--sections', type=int, default=1,
+                        help="sections per catalog course, to scale up the course table")
+    parser.add_argument('--drop-rate', type=float, default=0.08,
+                        help="probability that an enrollment ends up dropped")
+    parser.add_argument('--level-weights', default=','.join(str(w) for w in DEFAULT_LEVEL_WEIGHTS),
+                        help="relative share of students in levels 100,200,300,400")
+    parser.add_argument('--max-credits', type=int, default=MAX_CREDITS)
+    parser.add_argument('--term-start', default='2024-09-01', help="registration opening date")
+    parser.add_argument('--password', default='SecurePass123!', help="password for all seeded users")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--chunk-size', type=int, default=20000, help="students per COPY chunk")
+    parser.add_argument('--dry-run', action='store_true', help="generate rows without a database")
+    parser.add_argument('--host', default=os.environ.get('DB_HOST', 'localhost'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('DB_PORT', 5432)))
+    parser.add_argument('--user', default=os.environ.get('DB_USER', 'courseadmin'))
+    parser.add_argument('--password-db', default=os.environ.get('DB_PASSWORD', 'coursepass123'))
+    parser.add_argument('--database', default=os.environ.get('DB_NAME', 'course_registration'))
+    args = parser.parse_args(argv)
+
+    args.level_weights = [float(w) for w in args.level_weights.split(',')]
+    if len(args.level_weights) != len(LEVELS):
+        parser.error("--level-weights needs one weight per level (100,200,300,400)")
+    if not 0 <= args.drop_rate < 1:
+        parser.error("--drop-rate must be between 0 and 1")
+    if args.sections < 1 or args.chunk_size < 1 or args.workers < 1:
+        parser.error("--sections, --chunk-size and --workers must be positive")
+    args.tag = (args.tag or f"seed{args.seed}").lower()
+    return args
+
+
+def main(argv=None):
+    """Generate and load the synthetic institution"""
+    args = parse_args(argv)
+    started = time.time()
+
+    print("\n🌱 Synthetic Data Seeder")
+    print(f"{'='*60}")
+    print_info(f"Students: {args.students:,} | Seed: {args.seed} | Workers: {args.workers}")
+    print_info(f"Sections per course: {args.sections} | Drop rate: {args.drop_rate:.0%}")
+
+    check_not_seeded(args)
+    courses = expand_sections(load_catalog(), args.sections)
+    course_ids = ensure_courses(args, courses)
+    print_info(f"Courses available: {len(courses):,}")
+
+    # courses_by_level[level] = [[(id, credits) for each section] for each base course]
+    courses_by_level = {level: {} for level in LEVELS}
+    for course in courses:
+        sections = courses_by_level[course['level']].setdefault(course['base_code'], [])
+        sections.append((course_ids[course['course_code']], course['credits']))
+    courses_by_level = {level: list(by_code.values()) for level, by_code in courses_by_level.items()}
+
+    first_id = reserve_user_ids(args)
+    shared = {
+        'seed': args.seed,
+        'tag': args.tag,
+        'first_id': first_id,
+        'courses_by_level': courses_by_level,
+        'drop_rate': args.drop_rate,
+        'max_credits': args.max_credits,
+        'level_weights': args.level_weights,
+        'term_start': datetime.strptime(args.term_start, '%Y-%m-%d'),
+        'password_hash': password_hash(args.password),
+        'dry_run': args.dry_run,
+        'args': args,
+    }
+    jobs = []
+    for index, start in enumerate(range(0, args.students, args.chunk_size)):
+        job = dict(shared)
+        job.update(index=index, start=start, end=min(start + args.chunk_size, args.students))
+        jobs.append(job)
+
+    total_users = 0
+    total_enrollments = 0
+    with Pool(args.workers) as pool:
+        for done, (user_rows, enrollment_rows) in enumerate(
+                pool.imap_unordered(copy_chunk, jobs), start=1):
+            total_users += user_rows
+            total_enrollments += enrollment_rows
+            elapsed = time.time() - started
+            print(f"   [{done}/{len(jobs)}] {total_users:,} students, "
+                  f"{total_enrollments:,} enrollments ({total_enrollments / elapsed:,.0f} rows/s)")
+
+    finish_load(args)
+
+    elapsed = time.time() - started
+    print(f"\n✅ Seeded {total_users:,} students and {total_enrollments:,} enrollments "
+          f"in {elapsed:.1f}s{' (dry run)' if args.dry_run else ''}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n👋 Seeding interrupted by user")
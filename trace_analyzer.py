@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Trace Analyzer - Find where request time goes
+Run with: python3 trace_analyzer.py traces.jsonl [--route "GET /api/courses"] [--folded out.folded]
+
+Reads the trace file written by the backend (set TRACE_FILE, see
+backend/middleware/tracing.js) and prints, per route, how request time splits
+over the critical path: middleware, controller code, bcrypt, waiting for a
+pool client and each query. --folded writes collapsed stacks that
+flamegraph.pl or speedscope can render.
+"""
+
+import argparse
+import json
+import re
+import sys
+
+# Stage a span belongs to, for the per-route breakdown
+STAGES = [
+    ('middleware', re.compile(r'^middleware:')),
+    ('bcrypt', re.compile(r'^bcrypt\.')),
+    ('pool wait', re.compile(r'^pool\.wait$')),
+    ('query', re.compile(r'^query(\.coalesced)?$')),
+    ('controller', re.compile(r'^controller:')),
+]
+
+
+def print_info(message):
+    """Print informational message"""
+    print(f"📘 {message}")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def load_traces(path):
+    """Read one trace per line"""
+    traces = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                traces.append(json.loads(line))
+    return traces
+
+
+def stage_of(span):
+    """Map a span name to its stage"""
+    for stage, pattern in STAGES:
+        if pattern.match(span['name']):
+            return stage
+    return 'other'
+
+
+def frame_of(span):
+    """Frame label used in stacks; queries are labelled with their SQL"""
+    if span['name'] == 'query' and span.get('attributes', {}).get('sql'):
+        # ';' separates frames in collapsed stacks
+        return f"query: {span['attributes']['sql'][:60]}".replace(';', ',')
+    return span['name']
+
+
+def covered(intervals):
+    """Total length covered by a list of (start, end) intervals"""
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def self_times(trace):
+    """Yield (stack, stage, self_ms) for each span, plus the untraced remainder.
+
+    A span's self time is its duration minus the time covered by its children,
+    so the self times of one request add up to its critical path.
+    """
+    spans = {span['id']: span for span in trace['spans']}
+    children = {}
+    for span in trace['spans']:
+        children.setdefault(span['parent'], []).append(span)
+
+    def stack(span):
+        frames = []
+        while span is not None:
+            frames.append(frame_of(span))
+            span = spans.get(span['parent'])
+        return list(reversed(frames))
+
+    for span in trace['spans']:
+        child_time = covered([(c['start'], c['start'] + c['duration'])
+                              for c in children.get(span['id'], [])])
+        yield stack(span), stage_of(span), max(0.0, span['duration'] - child_time)
+
+    top_level = covered([(s['start'], s['start'] + s['duration']) for s in children.get(0, [])])
+    yield ['(untraced)'], 'untraced', max(0.0, trace['duration'] - top_level)
+
+
+def analyze(traces):
+    """Aggregate traces per route into stage totals, frame totals and folded stacks"""
+    routes = {}
+    for trace in traces:
+        key = f"{trace['method']} {trace['route']}"
+        route = routes.setdefault(key, {'durations': [], 'stages': {}, 'frames': {}, 'folded': {}})
+        route['durations'].append(trace['duration'])
+
+        for frames, stage, self_ms in self_times(trace):
+            route['stages'][stage] = route['stages'].get(stage, 0.0) + self_ms
+            frame = frames[-1]
+            route['frames'][frame] = route['frames'].get(frame, 0.0) + self_ms
+            folded = ';'.join([key] + frames)
+            route['folded'][folded] = route['folded'].get(folded, 0.0) + self_ms
+    return routes
+
+
+def print_report(routes, top):
+    """Print per-route critical-path breakdowns, slowest routes first"""
+    ordered = sorted(routes.items(), key=lambda item: -sum(item[1]['durations']))
+    for key, route in ordered:
+        durations = route['durations']
+        total = sum(durations) or 1.0
+        print(f"\n{'━'*72}")
+        print(f" 🛣️  {key}  —  {len(durations):,} requests, "
+              f"p50 {percentile(durations, 50):.1f} ms, p95 {percentile(durations, 95):.1f} ms, "
+              f"p99 {percentile(durations, 99):.1f} ms")
+        print(f"{'━'*72}")
+
+        print(" Critical path by stage (mean ms per request, share of time):")
+        for stage, ms in sorted(route['stages'].items(), key=lambda item: -item[1]):
+            share = ms / total
+            bar = '█' * int(round(share * 30))
+            print(f"   {stage:12} {ms / len(durations):>9.2f} ms {share:>6.1%}  {bar}")
+
+        print(f" Top {top} frames by self time:")
+        for frame, ms in sorted(route['frames'].items(), key=lambda item: -item[1])[:top]:
+            print(f"   {ms / len(durations):>9.2f} ms {ms / total:>6.1%}  {frame}")
+
+
+def write_folded(routes, path):
+    """Write collapsed stacks (frame;frame;frame value) in microseconds"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for route in routes.values():
+            for stack, ms in sorted(route['folded'].items()):
+                micros = int(round(ms * 1000))
+                if micros > 0:
+                    f.write(f"{stack} {micros}\n")
+
+
+def main(argv=None):
+    """Analyze a trace file"""
+    parser = argparse.ArgumentParser(description="Summarize backend request traces")
+    parser.add_argument('trace', help="JSONL trace file written by the backend")
+    parser.add_argument('--route', help="only this route, e.g. 'GET /api/courses'")
+    parser.add_argument('--top', type=int, default=8, help="frames to list per route")
+    parser.add_argument('--folded', help="write collapsed stacks for flame graphs to this file")
+    args = parser.parse_args(argv)
+
+    traces = load_traces(args.trace)
+    if args.route:
+        traces = [t for t in traces if f"{t['method']} {t['route']}" == args.route]
+    if not traces:
+        print("⚠️  No traces found")
+        return 1
+
+    print(f"\n🔬 Trace Analysis — {len(traces):,} requests from {args.trace}")
+    routes = analyze(traces)
+    print_report(routes, args.top)
+
+    if args.folded:
+        write_folded(routes, args.folded)
+        print()
+        print_info(f"Collapsed stacks written to {args.folded} (flamegraph.pl / speedscope)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
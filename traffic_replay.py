@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Traffic Replay Tool - Replay recorded API traffic for capacity testing
+Run with:
+    python3 traffic_replay.py replay traffic.jsonl --speed 10 --out run-a.json
+    python3 traffic_replay.py compare run-a.json run-b.json
+    python3 traffic_replay.py stand-in --port 5055
+
+Traces are recorded by the backend (set TRAFFIC_RECORD_FILE, see
+backend/middleware/trafficRecorder.js). Each pseudonymous user gets a fresh
+account on the target and their requests are replayed in order, while
+different users run concurrently on a pool of workers.
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_URL = "http://localhost:5000/api"
+
+# Backend routes (see api_discovery.py / portfolio_demo.py for the demo list)
+ENDPOINTS = [
+    ('GET', '/api/health'),
+    ('POST', '/api/auth/register'),
+    ('POST', '/api/auth/login'),
+    ('GET', '/api/auth/profile'),
+    ('GET', '/api/courses'),
+    ('GET', '/api/courses/:id'),
+    ('GET', '/api/courses/level/:level/semester/:semester'),
+    ('POST', '/api/courses'),
+    ('PUT', '/api/courses/:id'),
+    ('DELETE', '/api/courses/:id'),
+    ('POST', '/api/enrollments/enroll'),
+    ('PUT', '/api/enrollments/drop/:course_id'),
+    ('GET', '/api/enrollments/my-courses'),
+    ('GET', '/api/enrollments/jobs/:ticket'),
+    ('GET', '/api/enrollments'),
+    ('GET', '/api/enrollments/course/:course_id'),
+    ('POST', '/api/enrollments/rollover'),
+    ('GET', '/api/enrollments/rollover/:job_id'),
+]
+
+REPLAY_PASSWORD = "ReplayPass123!"
+
+
+def print_info(message):
+    """Print informational message"""
+    print(f"📘 {message}")
+
+
+def print_warning(message):
+    """Print warning message"""
+    print(f"⚠️  {message}")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def load_trace(path):
+    """Read a recorded trace, oldest request first"""
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    entries.sort(key=lambda e: e['ts'])
+    return entries
+
+
+def build_path(entry):
+    """Fill the route template with the recorded params"""
+    path = entry['route']
+    for name, value in (entry.get('params') or {}).items():
+        path = path.replace(f":{name}", str(value))
+    return path
+
+
+class Replayer:
+    """Replays a trace against a target, keeping each user's requests in order"""
+
+    def __init__(self, target, speed, workers, admin_email=None, admin_password=None):
+        self.target = target.rstrip('/')
+        self.speed = speed
+        self.workers = workers
+        self.admin_email = admin_email
+        self.admin_password = admin_password
+        self.run_id = datetime.now().strftime('%H%M%S')
+        self.tokens = {}
+        self.accounts = []
+        self.admin_token = None
+        self.results = []
+        self.skipped = 0
+        self.local = threading.local()
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def session(self):
+        """One requests.Session per worker thread"""
+        import requests
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def url(self, path):
+        """Recorded routes start with /api, the target URL already ends with it"""
+        return self.target + re.sub(r'^/api', '', path)
+
+    def register_account(self, level):
+        """Create a fresh student account on the target and return (email, token)"""
+        for attempt in range(3):
+            n = next(self.counter)
+            email = f"replay.{self.run_id}.{n}@replay.uniport.edu"
+            response = self.session().post(self.url('/api/auth/register'), json={
+                "full_name": f"Replay User {n}",
+                "email": email,
+                "password": REPLAY_PASSWORD,
+                "level": level or 100,
+                "student_id": f"RPL{self.run_id}{n:06d}",
+            }, timeout=30)
+            if response.status_code in (200, 201):
+                return email, response.json().get('token')
+            time.sleep(0.5 * (attempt + 1))
+        raise RuntimeError(f"register failed with {response.status_code}: {response.text[:200]}")
+
+    def provision(self, entries):
+        """Give every pseudonymous student an account, and log in as admin if needed"""
+        students = {}
+        needs_admin = False
+        for entry in entries:
+            user = entry.get('user')
+            if not user:
+                continue
+            if user.get('role') == 'admin':
+                needs_admin = True
+            else:
+                students.setdefault(user['id'], user.get('level'))
+
+        if needs_admin:
+            if self.admin_email and self.admin_password:
+                response = self.session().post(self.url('/api/auth/login'), json={
+                    "email": self.admin_email, "password": self.admin_password}, timeout=30)
+                if response.status_code == 200:
+                    self.admin_token = response.json().get('token')
+            if not self.admin_token:
+                print_warning("No admin login (--admin-email/--admin-password); admin requests will be skipped")
+
+        print_info(f"Provisioning {len(students):,} replay accounts...")
+        with ThreadPoolExecutor(self.workers) as pool:
+            accounts = pool.map(lambda item: (item[0], self.register_account(item[1])), students.items())
+            for pseudo_id, (email, token) in accounts:
+                self.tokens[pseudo_id] = token
+                self.accounts.append(email)
+
+    def request_body(self, entry):
+        """Recorded body with redacted fields filled in for the target"""
+        body = dict(entry.get('body') or {})
+        if entry['route'] == '/api/auth/register':
+            n = next(self.counter)
+            body.update({
+                "full_name": f"Replay User {n}",
+                "email": f"replay.{self.run_id}.{n}@replay.uniport.edu",
+                "password": REPLAY_PASSWORD,
+                "student_id": f"RPL{self.run_id}{n:06d}",
+                "phone": "+2348000000000",
+            })
+        elif entry['route'] == '/api/auth/login':
+            # Logins go to one of the provisioned accounts, so bcrypt cost is replayed too
+            email = random.choice(self.accounts) if self.accounts else self.admin_email
+            body.update({"email": email, "password": REPLAY_PASSWORD})
+        return body or None
+
+    def auth_headers(self, entry):
+        """Authorization header for the recorded identity, or None if we can't act as them"""
+        user = entry.get('user')
+        if not user:
+            return {}
+        token = self.admin_token if user.get('role') == 'admin' else self.tokens.get(user['id'])
+        if not token:
+            return None
+        return {'Authorization': f'Bearer {token}'}
+
+    def play(self, entry, due):
+        """Send one recorded request and record the outcome"""
+        headers = self.auth_headers(entry)
+        if headers is None:
+            with self.lock:
+                self.skipped += 1
+            return
+
+        started = time.monotonic()
+        result = {
+            'method': entry['method'],
+            'route': entry['route'],
+            'recorded_status': entry.get('status'),
+            'recorded_ms': entry.get('duration_ms'),
+            'lag_ms': max(0.0, (started - self.start - due) * 1000),
+        }
+        try:
+            response = self.session().request(
+                entry['method'], self.url(build_path(entry)),
+                params=entry.get('query') or None, json=self.request_body(entry),
+                headers=headers, timeout=60)
+            result['status'] = response.status_code
+        except Exception as e:
+            result['status'] = None
+            result['error'] = str(e)
+        result['latency_ms'] = (time.monotonic() - started) * 1000
+
+        with self.lock:
+            self.results.append(result)
+
+    def run(self, entries):
+        """Replay all entries; a user's next request waits for their previous one"""
+        # Anonymous requests have no ordering constraints, each is its own stream
+        streams = {}
+        for i, entry in enumerate(entries):
+            key = entry['user']['id'] if entry.get('user') else f"anonymous-{i}"
+            streams.setdefault(key, []).append(entry)
+
+        t0 = entries[0]['ts']
+        scale = 0 if self.speed == 0 else 1 / self.speed
+        due_at = lambda entry: (entry['ts'] - t0) / 1000 * scale
+
+        cond = threading.Condition()
+        ready = [(due_at(s[0]), n, key, 0) for n, (key, s) in enumerate(streams.items())]
+        heapq.heapify(ready)
+        sequence = itertools.count(len(ready))
+        remaining = [len(entries)]
+
+        def play_and_continue(key, index, due):
+            try:
+                self.play(streams[key][index], due)
+            finally:
+                with cond:
+                    remaining[0] -= 1
+                    if index + 1 < len(streams[key]):
+                        next_entry = streams[key][index + 1]
+                        heapq.heappush(ready, (due_at(next_entry), next(sequence), key, index + 1))
+                    cond.notify()
+
+        self.start = time.monotonic()
+        total = len(entries)
+        with ThreadPoolExecutor(self.workers) as pool:
+            last_report = self.start
+            while True:
+                with cond:
+                    while remaining[0] > 0:
+                        now = time.monotonic() - self.start
+                        if ready and ready[0][0] <= now:
+                            break
+                        wait = ready[0][0] - now if ready else 1.0
+                        cond.wait(timeout=min(wait, 1.0))
+                    if remaining[0] == 0:
+                        break
+                    due, _, key, index = heapq.heappop(ready)
+                pool.submit(play_and_continue, key, index, due)
+
+                if time.monotonic() - last_report > 5:
+                    last_report = time.monotonic()
+                    print(f"   {total - remaining[0]:,}/{total:,} requests replayed")
+
+        return time.monotonic() - self.start
+
+
+def summarize(results):
+    """Per-route latency percentiles and error rates"""
+    by_route = {}
+    for result in results:
+        by_route.setdefault(f"{result['method']} {result['route']}", []).append(result)
+
+    summary = {}
+    for route, items in sorted(by_route.items()):
+        latencies = [r['latency_ms'] for r in items if r.get('status') is not None]
+        errors = [r for r in items if r.get('status') is None or r['status'] >= 500]
+        summary[route] = {
+            'count': len(items),
+            'error_rate': len(errors) / len(items),
+            'shed': sum(1 for r in items if r.get('status') == 503),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+        }
+    return summary
+
+
+def print_summary(summary):
+    """Print a per-route summary table"""
+    print(f"\n{'Route':52} {'count':>7} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    print("-" * 93)
+    for route, s in summary.items():
+        print(f"{route:52} {s['count']:>7} {s['error_rate']:>6.1%} "
+              f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}")
+
+
+def command_replay(args):
+    """Replay a trace and save the results"""
+    entries = load_trace(args.trace)
+    if not entries:
+        print_warning("Trace is empty")
+        return 1
+
+    speed = 0 if args.speed == 'max' else float(args.speed.rstrip('x'))
+    span = (entries[-1]['ts'] - entries[0]['ts']) / 1000
+    print("\n🔁 Traffic Replay")
+    print(f"{'='*60}")
+    print_info(f"Trace: {args.trace} ({len(entries):,} requests over {span:,.0f}s)")
+    print_info(f"Target: {args.target} | Speed: {args.speed} | Workers: {args.workers}")
+
+    replayer = Replayer(args.target, speed, args.workers, args.admin_email, args.admin_password)
+    replayer.provision(entries)
+    elapsed = replayer.run(entries)
+
+    summary = summarize(replayer.results)
+    print_summary(summary)
+    lags = [r['lag_ms'] for r in replayer.results]
+    print(f"\n✅ Replayed {len(replayer.results):,} requests in {elapsed:.1f}s "
+          f"(skipped {replayer.skipped}, p95 schedule lag {percentile(lags, 95):.0f} ms)")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {'trace': args.trace, 'target': args.target, 'speed': args.speed,
+                         'workers': args.workers, 'elapsed_s': elapsed,
+                         'finished_at': datetime.now().isoformat()},
+                'summary': summary,
+                'results': replayer.results,
+            }, f)
+        print_info(f"Results saved to {args.out}")
+    return 0
+
+
+def command_compare(args):
+    """Show the latency and error delta between two replay runs"""
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['summary']
+    with open(args.candidate, encoding='utf-8') as f:
+        candidate = json.load(f)['summary']
+
+    def delta(a, b):
+        return f"{(b - a) / a:+.0%}" if a else "n/a"
+
+    print(f"\n{'Route':52} {'p50 Δ':>8} {'p95 Δ':>8} {'p99 Δ':>8} {'err% before → after':>22}")
+    print("-" * 103)
+    for route in sorted(set(baseline) | set(candidate)):
+        a, b = baseline.get(route), candidate.get(route)
+        if not a or not b:
+            print(f"{route:52} only in {'candidate' if b else 'baseline'}")
+            continue
+        print(f"{route:52} {delta(a['p50_ms'], b['p50_ms']):>8} {delta(a['p95_ms'], b['p95_ms']):>8} "
+              f"{delta(a['p99_ms'], b['p99_ms']):>8} "
+              f"{a['error_rate']:>10.1%} → {b['error_rate']:<9.1%}")
+    return 0
+
+
+def make_stand_in_handler(latency_ms, error_rate):
+    """HTTP handler answering every known endpoint with a canned response"""
+    patterns = [(method, re.compile('^' + re.sub(r':\w+', r'[^/]+', path) + '$'), path)
+                for method, path in ENDPOINTS]
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        def handle_request(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+
+            path = self.path.split('?')[0]
+            matched = next((route for method, pattern, route in patterns
+                            if method == self.command and pattern.match(path)), None)
+            time.sleep(latency_ms / 1000)
+
+            if matched is None:
+                status, body = 404, {'error': 'Route not found'}
+            elif random.random() < error_rate:
+                status, body = 500, {'error': 'Stand-in injected error'}
+            elif matched in ('/api/auth/register', '/api/auth/login'):
+                status = 201 if matched.endswith('register') else 200
+                body = {'token': 'stand-in-token', 'user': {'id': 1, 'role': 'student'}}
+            else:
+                status, body = 200, {'message': 'ok'}
+
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInHandler
+
+
+def command_stand_in(args):
+    """Serve a local stand-in for the API"""
+    server = ThreadingHTTPServer(('127.0.0.1', args.port),
+                                 make_stand_in_handler(args.latency_ms, args.error_rate))
+    print(f"🧪 Stand-in API on http://127.0.0.1:{args.port}/api "
+          f"({args.latency_ms} ms latency, {args.error_rate:.0%} errors)")
+    server.serve_forever()
+
+
+def main(argv=None):
+    """Parse the command line and run a subcommand"""
+    parser = argparse.ArgumentParser(description="Replay recorded API traffic")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    replay = commands.add_parser('replay', help="replay a recorded trace against a target")
+    replay.add_argument('trace', help="JSONL file written by the backend traffic recorder")
+    replay.add_argument('--target', default=BASE_URL)
+    replay.add_argument('--speed', default='1',
+                        help="time scale: 1, 10 (or 10x) ... or 'max' for as fast as possible")
+    replay.add_argument('--workers', type=int, default=32)
+    replay.add_argument('--admin-email', help="admin account used for admin requests")
+    replay.add_argument('--admin-password')
+    replay.add_argument('--out', help="save results as JSON for compare")
+    replay.set_defaults(func=command_replay)
+
+    compare = commands.add_parser('compare', help="latency/error delta between two runs")
+    compare.add_argument('baseline')
+    compare.add_argument('candidate')
+    compare.set_defaults(func=command_compare)
+
+    stand_in = commands.add_parser('stand-in', help="serve a local stand-in for the API")
+    stand_in.add_argument('--port', type=int, default=5055)
+    stand_in.add_argument('--latency-ms', type=float, default=5)
+    stand_in.add_argument('--error-rate', type=float, default=0.0)
+    stand_in.set_defaults(func=command_stand_in)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n👋 Replay interrupted by user")